@@ -29,17 +29,33 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
+from pathlib import Path
 from typing import Optional
 
 import inkex
-from inkex import Circle, Group, Rectangle, Style, TextElement, Transform, Tspan
+from inkex import (
+    Circle, ClipPath, Defs, Group, PathElement, Rectangle, TextElement, Transform, Tspan,
+)
+from lxml import etree
 
-from glyph_library import GlyphLibrary
+from glyph_library import load_glyph_library
 from dicts import BOUNDING_BOX_TOP, TOP_RIGHT_X, TOP_RIGHT_Y, BOTTOM_RIGHT_X, BOTTOM_RIGHT_Y
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Compiled XPath queries reused for every hole's yardage clip-path
+SVG_NS = {'svg': 'http://www.w3.org/2000/svg'}
+_DEFS_XPATH = etree.XPath('.//svg:defs', namespaces=SVG_NS)
+_CLIP_PATH_BY_ID_XPATH = etree.XPath('.//svg:clipPath[@id=$clip_id]', namespaces=SVG_NS)
+
+# Prebuilt style string for the white terrain/tee mask rectangles
+MASK_STYLE = 'fill:#ffffff;stroke:none'
+
+# Prebuilt style string for the hole number circle (0.125mm is half of the standard 0.25mm stroke)
+CIRCLE_STYLE = 'fill:none;stroke:#000000;stroke-width:0.125mm'
+
 
 class AddHoleLabel(inkex.EffectExtension):
     """
@@ -174,13 +190,13 @@ class AddHoleLabel(inkex.EffectExtension):
         # Remove existing mask if present
         mask_id = f'terrain_mask_{hole_num:02d}'
         existing_mask = None
-        for child in list(geo_group):
+        for child in geo_group:
             if child.get('id') == mask_id:
                 existing_mask = child
                 break
         if existing_mask is not None:
             geo_group.remove(existing_mask)
-            logger.info(f"Removed existing terrain mask for hole {hole_num}")
+            logger.info("Removed existing terrain mask for hole %d", hole_num)
 
         # ===== STEP 1: Check and reorder geo_XX children =====
         # Expected order (bottom to top): other → bunkers → fairways → green_XX
@@ -206,42 +222,36 @@ class AddHoleLabel(inkex.EffectExtension):
         right_third_height = top_height
 
         # Convert to user units (page coordinates)
-        left_x_uu = self.svg.unittouu(f"{left_two_thirds_x}in")
-        left_y_uu = self.svg.unittouu(f"{left_two_thirds_y}in")
-        left_w_uu = self.svg.unittouu(f"{left_two_thirds_width}in")
-        left_h_uu = self.svg.unittouu(f"{left_two_thirds_height}in")
-
-        right_x_uu = self.svg.unittouu(f"{right_third_x}in")
-        right_y_uu = self.svg.unittouu(f"{right_third_y}in")
-        right_w_uu = self.svg.unittouu(f"{right_third_width}in")
-        right_h_uu = self.svg.unittouu(f"{right_third_height}in")
+        # unittouu() is linear, so resolve the inch factor once and scale all
+        # eight values in one pass instead of parsing eight unit strings
+        uu_per_inch = self.svg.unittouu("1in")
+        (
+            left_x_uu, left_y_uu, left_w_uu, left_h_uu,
+            right_x_uu, right_y_uu, right_w_uu, right_h_uu,
+        ) = [
+            value * uu_per_inch for value in (
+                left_two_thirds_x, left_two_thirds_y, left_two_thirds_width, left_two_thirds_height,
+                right_third_x, right_third_y, right_third_width, right_third_height,
+            )
+        ]
 
         # Create right 1/3 white mask rectangle
-        mask = Rectangle()
-        mask.set('id', mask_id)
-        mask.set('x', str(right_x_uu))
-        mask.set('y', str(right_y_uu))
-        mask.set('width', str(right_w_uu))
-        mask.set('height', str(right_h_uu))
-        mask.style = Style({'fill': '#ffffff', 'stroke': 'none'})
-
         # ===== STEP 3: Apply inverse transform to mask =====
-        # Mask is a child of geo_group, so it needs inverse transform
-        # to appear at the correct page coordinates despite geo_group's transforms.
-        geo_transform = geo_group.transform or Transform()
-        if geo_transform:
-            inverse_transform = -geo_transform  # inkex Transform supports negation for inverse
-            mask.transform = inverse_transform
+        # Mask is a child of geo_group, so _create_mask_rectangle() gives it the
+        # inverse transform to appear at the correct page coordinates.
+        mask = self._create_mask_rectangle(
+            mask_id, right_x_uu, right_y_uu, right_w_uu, right_h_uu, geo_group
+        )
 
         # ===== STEP 4: Insert mask at appropriate z-order position =====
         # terrain_mask (white, right 1/3): between 'other' and 'bunkers' to cover terrain
 
         # Remove any existing clip rectangle from previous runs (cleanup)
         clip_rect_id = f'clip_rect_{hole_num:02d}'
-        for child in list(geo_group):
+        for child in geo_group:
             if child.get('id') == clip_rect_id:
                 geo_group.remove(child)
-                logger.info(f"Removed obsolete clip rectangle for hole {hole_num}")
+                logger.info("Removed obsolete clip rectangle for hole %d", hole_num)
                 break
 
         # Find insertion points
@@ -259,7 +269,7 @@ class AddHoleLabel(inkex.EffectExtension):
         # Insert terrain_mask (white) between 'other' and 'bunkers'
         if bunkers_index is not None:
             geo_group.insert(bunkers_index, mask)
-            logger.info(f"Inserted terrain mask for hole {hole_num} before bunkers (index {bunkers_index})")
+            logger.info("Inserted terrain mask for hole %d before bunkers (index %d)", hole_num, bunkers_index)
             # Adjust last_yardage_index since we inserted before it
             if last_yardage_index is not None and last_yardage_index >= bunkers_index:
                 last_yardage_index += 1
@@ -275,17 +285,17 @@ class AddHoleLabel(inkex.EffectExtension):
 
             if other_index is not None:
                 geo_group.insert(other_index + 1, mask)
-                logger.info(f"Inserted terrain mask for hole {hole_num} after other (index {other_index + 1})")
+                logger.info("Inserted terrain mask for hole %d after other (index %d)", hole_num, other_index + 1)
                 # Adjust last_yardage_index
                 if last_yardage_index is not None and last_yardage_index > other_index:
                     last_yardage_index += 1
             else:
                 geo_group.insert(0, mask)
-                logger.info(f"Inserted terrain mask for hole {hole_num} at beginning")
+                logger.info("Inserted terrain mask for hole %d at beginning", hole_num)
                 if last_yardage_index is not None:
                     last_yardage_index += 1
 
-        logger.info(f"Successfully generated terrain mask for hole {hole_num}")
+        logger.info("Successfully generated terrain mask for hole %d", hole_num)
 
         # ===== STEP 5: Create clip-path with pre-transformed coordinates =====
         # The clipPath is in <defs> at document root. When referenced by yardage_group
@@ -301,7 +311,6 @@ class AddHoleLabel(inkex.EffectExtension):
         #   2. Get full_transform = composed_transform() of yardage_group
         #   3. Local corners = inverse(full_transform).apply_to_point(page_corner)
         #   4. Create path with explicit local corner coordinates (NO transform attr)
-        from inkex import Defs, ClipPath, PathElement
 
         # Find yardage line groups in geo_XX
         yardage_groups = []
@@ -314,7 +323,8 @@ class AddHoleLabel(inkex.EffectExtension):
         if yardage_groups:
             # Get or create defs section
             root = self.document.getroot()
-            defs = root.find('.//{http://www.w3.org/2000/svg}defs')
+            defs_matches = _DEFS_XPATH(root)
+            defs = defs_matches[0] if defs_matches else None
             if defs is None:
                 defs = Defs()
                 root.insert(0, defs)
@@ -323,8 +333,9 @@ class AddHoleLabel(inkex.EffectExtension):
             clip_id = f'yardage_clip_{hole_num:02d}'
 
             # Remove existing clip-path if present
-            existing_clip = root.find(f'.//{{{inkex.NSS["svg"]}}}clipPath[@id="{clip_id}"]')
-            if existing_clip is not None:
+            clip_matches = _CLIP_PATH_BY_ID_XPATH(root, clip_id=clip_id)
+            if clip_matches:
+                existing_clip = clip_matches[0]
                 existing_clip.getparent().remove(existing_clip)
 
             clip_path_elem = ClipPath()
@@ -374,7 +385,7 @@ class AddHoleLabel(inkex.EffectExtension):
             for yg in yardage_groups:
                 yg.set('clip-path', f'url(#{clip_id})')
 
-            logger.info(f"Applied clip-path to {len(yardage_groups)} yardage line group(s)")
+            logger.info("Applied clip-path to %d yardage line group(s)", len(yardage_groups))
 
     def _generate_tee_mask(self, hole_num: int, geo_group: Group, tee_bounds: dict) -> None:
         """
@@ -403,28 +414,18 @@ class AddHoleLabel(inkex.EffectExtension):
         # Remove existing tee mask if present
         mask_id = f'tee_mask_{hole_num:02d}'
         existing_mask = None
-        for child in list(geo_group):
+        for child in geo_group:
             if child.get('id') == mask_id:
                 existing_mask = child
                 break
         if existing_mask is not None:
             geo_group.remove(existing_mask)
-            logger.info(f"Removed existing tee mask for hole {hole_num}")
-
-        # Create white mask rectangle
-        mask = Rectangle()
-        mask.set('id', mask_id)
-        mask.set('x', str(mask_left))
-        mask.set('y', str(mask_top))
-        mask.set('width', str(mask_width))
-        mask.set('height', str(mask_height))
-        mask.style = Style({'fill': '#ffffff', 'stroke': 'none'})
-
-        # Apply inverse transform (same as terrain mask)
-        geo_transform = geo_group.transform or Transform()
-        if geo_transform:
-            inverse_transform = -geo_transform
-            mask.transform = inverse_transform
+            logger.info("Removed existing tee mask for hole %d", hole_num)
+
+        # Create white mask rectangle with inverse transform (same as terrain mask)
+        mask = self._create_mask_rectangle(
+            mask_id, mask_left, mask_top, mask_width, mask_height, geo_group
+        )
 
         # Find insertion point: right after terrain_mask (or same position if not found)
         terrain_mask_id = f'terrain_mask_{hole_num:02d}'
@@ -437,7 +438,7 @@ class AddHoleLabel(inkex.EffectExtension):
         if terrain_mask_index is not None:
             # Insert right after terrain mask
             geo_group.insert(terrain_mask_index + 1, mask)
-            logger.info(f"Inserted tee mask for hole {hole_num} after terrain mask (index {terrain_mask_index + 1})")
+            logger.info("Inserted tee mask for hole %d after terrain mask (index %d)", hole_num, terrain_mask_index + 1)
         else:
             # Fallback: insert at same position as terrain mask would be (before bunkers)
             bunkers_index = None
@@ -450,12 +451,54 @@ class AddHoleLabel(inkex.EffectExtension):
 
             if bunkers_index is not None:
                 geo_group.insert(bunkers_index, mask)
-                logger.info(f"Inserted tee mask for hole {hole_num} before bunkers (index {bunkers_index})")
+                logger.info("Inserted tee mask for hole %d before bunkers (index %d)", hole_num, bunkers_index)
             else:
                 geo_group.insert(0, mask)
-                logger.info(f"Inserted tee mask for hole {hole_num} at beginning")
+                logger.info("Inserted tee mask for hole %d at beginning", hole_num)
+
+        logger.info("Successfully generated tee mask for hole %d: %.2fx%.2f uu", hole_num, mask_width, mask_height)
+
+    def _create_mask_rectangle(
+        self,
+        mask_id: str,
+        x_uu: float,
+        y_uu: float,
+        width_uu: float,
+        height_uu: float,
+        geo_group: Group,
+    ) -> Rectangle:
+        """
+        Create a white mask rectangle at page coordinates inside geo_XX.
+
+        The rectangle is built in a single constructor call with a prebuilt
+        style string, and gets the inverse of geo_group's transform so it lands
+        at the given page position despite geo_XX's Stage 3 transforms.
+
+        Args:
+            mask_id: ID for the mask rectangle
+            x_uu: Left edge in user units (page coordinates)
+            y_uu: Top edge in user units (page coordinates)
+            width_uu: Width in user units
+            height_uu: Height in user units
+            geo_group: The geo_XX group the mask will be inserted into
+
+        Returns:
+            White, unstroked Rectangle element
+        """
+        mask = Rectangle(
+            id=mask_id,
+            x=str(x_uu),
+            y=str(y_uu),
+            width=str(width_uu),
+            height=str(height_uu),
+            style=MASK_STYLE,
+        )
+
+        geo_transform = geo_group.transform or Transform()
+        if geo_transform:
+            mask.transform = -geo_transform  # inkex Transform supports negation for inverse
 
-        logger.info(f"Successfully generated tee mask for hole {hole_num}: {mask_width:.2f}x{mask_height:.2f} uu")
+        return mask
 
     def _ensure_geo_child_order(self, geo_group: Group, hole_num: int) -> None:
         """
@@ -477,7 +520,7 @@ class AddHoleLabel(inkex.EffectExtension):
         yardage_elements = []  # Yardage line groups (should be above green_XX)
         other_elements = []  # Elements that don't match known categories
 
-        for child in list(geo_group):
+        for child in geo_group:
             if isinstance(child, Group):
                 # Use .label property for consistency with Stage 2
                 label = child.label
@@ -509,19 +552,19 @@ class AddHoleLabel(inkex.EffectExtension):
         # In new Stage 2, they should be siblings to green_XX (above it in z-order)
         if other_group is not None:
             yardage_children_to_migrate = []
-            for child in list(other_group):
+            for child in other_group:
                 if isinstance(child, Group):
                     child_label = child.label
                     if child_label and 'yardage' in child_label.lower():
                         # Found yardage lines inside 'other' group - need to migrate
                         yardage_children_to_migrate.append(child)
-                        logger.info(f"Found yardage lines inside 'other' group (old Stage 2 structure) - will migrate to above green_XX")
+                        logger.info("Found yardage lines inside 'other' group (old Stage 2 structure) - will migrate to above green_XX")
 
             # Remove yardage lines from 'other' group and add to yardage_elements
             for yardage_child in yardage_children_to_migrate:
                 other_group.remove(yardage_child)
                 yardage_elements.append(yardage_child)
-                logger.info(f"Migrated yardage lines from 'other' group to above green_XX (new Stage 2 structure)")
+                logger.info("Migrated yardage lines from 'other' group to above green_XX (new Stage 2 structure)")
 
         # Check if reordering is needed by comparing current order to expected
         current_order = list(geo_group)
@@ -567,7 +610,7 @@ class AddHoleLabel(inkex.EffectExtension):
             for elem in other_elements:
                 geo_group.append(elem)
 
-            logger.info(f"Reordered geo_{hole_num:02d} children to correct z-order")
+            logger.info("Reordered geo_%02d children to correct z-order", hole_num)
 
     def validate_font_family(self, font_family: str) -> str:
         """
@@ -585,7 +628,6 @@ class AddHoleLabel(inkex.EffectExtension):
         Raises:
             inkex.AbortExtension: If neither provided font nor JetBrains Mono Nerd Font are available
         """
-        import os
 
         # Check if font_family is empty or just whitespace
         if not font_family or not font_family.strip():
@@ -644,7 +686,6 @@ class AddHoleLabel(inkex.EffectExtension):
         par = self.options.par
 
         # Validate font family and fallback to JetBrains Mono Nerd Font if invalid
-        import os
         font_name = self.validate_font_family(self.options.font_family.strip())
 
         # Load glyph library for accurate text measurements
@@ -656,7 +697,7 @@ class AddHoleLabel(inkex.EffectExtension):
         )
 
         try:
-            self.glyph_library = GlyphLibrary(library_path)
+            self.glyph_library = load_glyph_library(library_path)
             logger.info("Loaded glyph library from: %s", library_path)
         except Exception as e:
             logger.error("Failed to load glyph library: %s", e)
@@ -754,7 +795,7 @@ class AddHoleLabel(inkex.EffectExtension):
                 return
 
             # Step 2: Remember the original position in top group (for preserving outliner order)
-            original_index = list(top_group).index(hole_group)
+            original_index = top_group.index(hole_group)
             logger.info("Found hole_%02d at index %d in 'top' group", hole_num, original_index)
 
             # Step 3: Rename hole_XX to geo_XX
@@ -825,7 +866,7 @@ class AddHoleLabel(inkex.EffectExtension):
         try:
             self._generate_terrain_mask(hole_num, wrapper_group, hole_group)
         except Exception as e:
-            logger.warning(f"Could not generate terrain mask for hole {hole_num}: {e}")
+            logger.warning("Could not generate terrain mask for hole %d: %s", hole_num, e)
 
         # ==== Generate tee yardages mask (white box behind tee labels) ====
         # This prevents terrain features from interfering with tee yardage text
@@ -833,7 +874,7 @@ class AddHoleLabel(inkex.EffectExtension):
             try:
                 self._generate_tee_mask(hole_num, hole_group, tee_bounds)
             except Exception as e:
-                logger.warning(f"Could not generate tee mask for hole {hole_num}: {e}")
+                logger.warning("Could not generate tee mask for hole %d: %s", hole_num, e)
 
     def _find_hole_group(self, root: inkex.SvgDocumentElement, hole_id: str) -> Optional[Group]:
         """
@@ -929,13 +970,7 @@ class AddHoleLabel(inkex.EffectExtension):
         Returns:
             Circle element with 0.125mm black stroke (half of standard 0.25mm)
         """
-        circle = Circle(cx=str(cx_uu), cy=str(cy_uu), r=str(radius_uu))
-        circle.style = Style({
-            'fill': 'none',
-            'stroke': '#000000',
-            'stroke-width': '0.125mm'  # Half of standard 0.25mm stroke
-        })
-        return circle
+        return Circle(cx=str(cx_uu), cy=str(cy_uu), r=str(radius_uu), style=CIRCLE_STYLE)
 
     def _create_centered_hole_number(self, hole_num: int, circle_cx: float, circle_cy: float) -> Group:
         """
@@ -967,18 +1002,15 @@ class AddHoleLabel(inkex.EffectExtension):
             hole_number_font_size, letter_spacing
         )
 
-        # Compose text using glyph library to get accurate dimensions
-        # Note: We'll position at (0, 0) first to get dimensions, then reposition
-        text_group, width, height = self.glyph_library.compose_text(
+        # Measure text using glyph library to get accurate dimensions
+        width, height = self.glyph_library.measure_text(
             str(hole_num),
-            x=0,
-            y=0,
             font_size=hole_number_font_size,
             spacing=letter_spacing  # 5% spacing between digits (e.g., "1 0" for hole 10)
         )
 
         logger.info(
-            "Hole number '%s' composed: width=%.2fpx, height=%.2fpx",
+            "Hole number '%s' measured: width=%.2fpx, height=%.2fpx",
             str(hole_num), width, height
         )
 
@@ -994,7 +1026,7 @@ class AddHoleLabel(inkex.EffectExtension):
             circle_cx, circle_cy, width, height, centered_x, centered_y
         )
 
-        # Recompose at the centered position
+        # Compose at the centered position
         text_group, width, height = self.glyph_library.compose_text(
             str(hole_num),
             x=centered_x,
@@ -1028,11 +1060,9 @@ class AddHoleLabel(inkex.EffectExtension):
         # Use user's par_font_size parameter directly
         par_font_size = int(self.options.par_font_size)
 
-        # First compose to get dimensions for centering
-        text_group, width, height = self.glyph_library.compose_text(
+        # Measure first to get dimensions for centering
+        width, height = self.glyph_library.measure_text(
             str(par),
-            x=0,
-            y=0,
             font_size=par_font_size,
             spacing=0
         )
@@ -1044,7 +1074,7 @@ class AddHoleLabel(inkex.EffectExtension):
         # Position below circle bottom edge + offset (use bottom-left positioning)
         text_y = cy_uu + radius_uu + offset_uu
 
-        # Recompose at final position
+        # Compose at final position
         text_group, width, height = self.glyph_library.compose_text(
             str(par),
             x=text_x,
@@ -1095,6 +1125,26 @@ class AddHoleLabel(inkex.EffectExtension):
 
         return text_group, width, height
 
+    def _measure_tee_text(self, text_content: str) -> tuple[float, float]:
+        """
+        Measure tee yardage text with the same font size and spacing as
+        _create_tee_text_element(), without building any glyph elements.
+
+        Args:
+            text_content: The text to measure
+
+        Returns:
+            Tuple of (width, height) in user units
+        """
+        tee_font_size = int(self.options.tee_font_size)
+        letter_spacing = tee_font_size * self.TEE_LETTER_SPACING_SCALE
+
+        return self.glyph_library.measure_text(
+            text_content,
+            font_size=tee_font_size,
+            spacing=letter_spacing
+        )
+
     def _create_tee_yardages(self, hole_num: int) -> tuple[Optional[Group], Optional[dict]]:
         """
         Create tee box yardage display with three-element formatting and bottom-up positioning.
@@ -1148,6 +1198,7 @@ class AddHoleLabel(inkex.EffectExtension):
 
         # Use user's tee_font_size parameter directly
         tee_font_size = int(self.options.tee_font_size)
+        letter_spacing = tee_font_size * self.TEE_LETTER_SPACING_SCALE
 
         # Calculate proportional spacing as % of tee yardage font size
         element_spacing_uu = tee_font_size * self.TEE_ELEMENT_SPACING_SCALE  # 20% of tee font
@@ -1163,17 +1214,17 @@ class AddHoleLabel(inkex.EffectExtension):
         # STEP 1: Measure actual colon width and find widest yardage using glyph library
 
         # Get actual colon width from glyph library (no approximations!)
-        _, colon_width_uu, colon_height_uu = self._create_tee_text_element(
-            ':', 0, 0
-        )
+        colon_width_uu, colon_height_uu = self._measure_tee_text(':')
 
         logger.info("Measured colon width: %.2fpx (actual measurement at %dpt)", colon_width_uu, tee_font_size)
 
         # Find the widest yardage to determine right edge alignment
-        max_yardage_width_uu = 0.0
+        # (widths are kept so each line can reuse its own measurement below)
+        yardage_widths: dict[int, float] = {}
         for _, yardage in tees:
-            _, yardage_width_uu, _ = self._create_tee_text_element(str(yardage), 0, 0)
-            max_yardage_width_uu = max(max_yardage_width_uu, yardage_width_uu)
+            if yardage not in yardage_widths:
+                yardage_widths[yardage], _ = self._measure_tee_text(str(yardage))
+        max_yardage_width_uu = max(yardage_widths.values())
 
         logger.info("Widest yardage: %.2fpx", max_yardage_width_uu)
 
@@ -1200,27 +1251,32 @@ class AddHoleLabel(inkex.EffectExtension):
         # This ensures Tee 1 appears at top, Tee 6 at bottom (conventional yardage book order)
         for idx, (name, yardage) in enumerate(reversed(tees)):
             # Measure name width to calculate right-aligned position
-            _, name_width_uu, _ = self._create_tee_text_element(name, 0, 0)
+            name_width_uu, _ = self._measure_tee_text(name)
 
             # Position name so its right edge is at (colon_x - spacing)
             name_x_uu = colon_x_uu - element_spacing_uu - name_width_uu
 
-            # Measure THIS yardage's width to calculate right-aligned position
-            _, this_yardage_width_uu, _ = self._create_tee_text_element(str(yardage), 0, 0)
+            # Use THIS yardage's width (measured in step 1) to calculate right-aligned position
+            this_yardage_width_uu = yardage_widths[yardage]
 
             # Position yardage so its right edge aligns with the right boundary
             # This ensures all yardages are right-aligned regardless of their width
             this_yardage_x_uu = right_edge_uu - this_yardage_width_uu
 
             # Create the three elements for this line with measured positions
-            tee_name_elem, _, name_height_uu = self._create_tee_text_element(
-                name, name_x_uu, current_y_uu
-            )
-            colon_elem, _, _ = self._create_tee_text_element(
-                ':', colon_x_uu, current_y_uu
-            )
-            yardage_elem, _, yardage_height_uu = self._create_tee_text_element(
-                str(yardage), this_yardage_x_uu, current_y_uu
+            (
+                (tee_name_elem, _, name_height_uu),
+                (colon_elem, _, _),
+                (yardage_elem, _, yardage_height_uu),
+            ) = self.glyph_library.compose_many(
+                [name, ':', str(yardage)],
+                [
+                    (name_x_uu, current_y_uu),
+                    (colon_x_uu, current_y_uu),
+                    (this_yardage_x_uu, current_y_uu),
+                ],
+                font_size=tee_font_size,
+                spacing=letter_spacing
             )
 
             # Update bounding box tracking
@@ -1276,21 +1332,21 @@ class AddHoleLabel(inkex.EffectExtension):
         using Inkscape's error message system. Users can copy these exact names
         (without .svg extension) into the Glyph Library Font field.
         """
-        import os
-        from pathlib import Path
 
         # Get glyph_libraries folder path
         glyph_dir = Path(os.path.dirname(__file__)) / 'glyph_libraries'
 
         if not glyph_dir.exists():
-            inkex.errormsg("=" * 60)
-            inkex.errormsg("ERROR: glyph_libraries folder not found!")
-            inkex.errormsg("=" * 60)
-            inkex.errormsg(f"Expected location: {glyph_dir}")
-            inkex.errormsg("")
-            inkex.errormsg("Please create the glyph_libraries folder and add")
-            inkex.errormsg("glyph library .svg files using the Prepare Glyph Library tool.")
-            inkex.errormsg("=" * 60)
+            inkex.errormsg("\n".join([
+                "=" * 60,
+                "ERROR: glyph_libraries folder not found!",
+                "=" * 60,
+                f"Expected location: {glyph_dir}",
+                "",
+                "Please create the glyph_libraries folder and add",
+                "glyph library .svg files using the Prepare Glyph Library tool.",
+                "=" * 60,
+            ]))
             return
 
         # Find all .svg files (excluding TEMPLATE.svg and README.md)
@@ -1300,34 +1356,38 @@ class AddHoleLabel(inkex.EffectExtension):
         ])
 
         if not svg_files:
-            inkex.errormsg("=" * 60)
-            inkex.errormsg("NO GLYPH LIBRARY FONTS FOUND")
-            inkex.errormsg("=" * 60)
-            inkex.errormsg(f"Folder: {glyph_dir}")
-            inkex.errormsg("")
-            inkex.errormsg("Please create glyph libraries using:")
-            inkex.errormsg("Extensions → Golf Cartographer → Prepare Glyph Library")
-            inkex.errormsg("=" * 60)
+            inkex.errormsg("\n".join([
+                "=" * 60,
+                "NO GLYPH LIBRARY FONTS FOUND",
+                "=" * 60,
+                f"Folder: {glyph_dir}",
+                "",
+                "Please create glyph libraries using:",
+                "Extensions → Golf Cartographer → Prepare Glyph Library",
+                "=" * 60,
+            ]))
             return
 
-        # Display available fonts
-        inkex.errormsg("=" * 60)
-        inkex.errormsg(f"AVAILABLE GLYPH LIBRARY FONTS ({len(svg_files)} found)")
-        inkex.errormsg("=" * 60)
-        inkex.errormsg(f"Location: {glyph_dir}")
-        inkex.errormsg("")
-
-        for font_name in svg_files:
-            inkex.errormsg(f"  • {font_name}")
-
-        inkex.errormsg("")
-        inkex.errormsg("=" * 60)
-        inkex.errormsg("USAGE:")
-        inkex.errormsg("1. Copy the exact font name from the list above")
-        inkex.errormsg("2. Go to the 'Add Label' tab")
-        inkex.errormsg("3. Paste the name into the 'Glyph Library Font' field")
-        inkex.errormsg("4. Do NOT include the .svg extension")
-        inkex.errormsg("=" * 60)
+        # Display available fonts (built up front, emitted as one message)
+        lines = [
+            "=" * 60,
+            f"AVAILABLE GLYPH LIBRARY FONTS ({len(svg_files)} found)",
+            "=" * 60,
+            f"Location: {glyph_dir}",
+            "",
+        ]
+        lines.extend(f"  • {font_name}" for font_name in svg_files)
+        lines += [
+            "",
+            "=" * 60,
+            "USAGE:",
+            "1. Copy the exact font name from the list above",
+            "2. Go to the 'Add Label' tab",
+            "3. Paste the name into the 'Glyph Library Font' field",
+            "4. Do NOT include the .svg extension",
+            "=" * 60,
+        ]
+        inkex.errormsg("\n".join(lines))
 
         logger.info("Listed %d available glyph library fonts", len(svg_files))
 
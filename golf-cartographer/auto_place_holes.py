@@ -36,8 +36,8 @@ from inkex import Group, Transform
 # Import shared utilities
 from transform_utils import (
     SimpleBoundingBox,
-    get_cumulative_scale,
-    set_stroke_recursive,
+    apply_stroke_compensation_batch,
+    clear_scale_cache,
     measure_elements_via_temp_group,
 )
 from geometry_utils import (
@@ -89,6 +89,14 @@ class AutoPlaceHoles(inkex.EffectExtension):
         processed_holes = []
         failed_holes = []
 
+        # Index groups once so the per-hole lookups below don't rescan the tree
+        self._index_groups(root)
+
+        # unittouu() is linear, so the inch factor is resolved once per run and
+        # the box dimensions are scaled by it instead of parsing unit strings
+        # for every hole and green
+        self._uu_per_inch = self.svg.unittouu("1in")
+
         # Process all 18 holes in sequence
         for hole_num in range(1, 19):
             hole_id = f"hole_{hole_num:02d}"
@@ -105,13 +113,7 @@ class AutoPlaceHoles(inkex.EffectExtension):
                 failed_holes.append(f"{hole_id} (error: {str(e)})")
 
         # Move all processed holes to 'top' group
-        top_group = None
-        for elem in root.iter():
-            if isinstance(elem, Group):
-                label = elem.get(inkex.addNS('label', 'inkscape'))
-                if label and label.lower() == 'top':
-                    top_group = elem
-                    break
+        top_group = self._groups_by_label.get('top')
 
         if top_group is not None:
             for hole_id in processed_holes:
@@ -131,7 +133,7 @@ class AutoPlaceHoles(inkex.EffectExtension):
                 continue
 
             other_group = None
-            for child in list(hole_group):
+            for child in hole_group:
                 if isinstance(child, Group):
                     label = child.get(inkex.addNS('label', 'inkscape'))
                     if label and label.lower() == 'other':
@@ -194,6 +196,10 @@ class AutoPlaceHoles(inkex.EffectExtension):
         # Using full scale compensation (no vector-effect) for all elements
         TARGET_STROKE_MM = 0.25
 
+        # Holes were moved and transformed above, so start from a fresh scale cache;
+        # siblings within a hole then share their ancestors' cached scales
+        clear_scale_cache()
+
         # Apply strokes to holes in "top" area
         for hole_num in range(1, 19):
             hole_id = f"hole_{hole_num:02d}"
@@ -203,6 +209,7 @@ class AutoPlaceHoles(inkex.EffectExtension):
                 continue
 
             green_id = f"green_{hole_num:02d}"
+            stroke_children = []
 
             for child in hole_group:
                 child_id = child.get('id')
@@ -220,25 +227,21 @@ class AutoPlaceHoles(inkex.EffectExtension):
                         should_set_stroke = True
 
                 if should_set_stroke:
-                    # Apply scale compensation to achieve target stroke width
-                    cumulative_scale = get_cumulative_scale(child)
-                    if cumulative_scale <= 0:
-                        cumulative_scale = 1.0
-                    compensated_stroke_mm = TARGET_STROKE_MM / cumulative_scale
-                    set_stroke_recursive(child, compensated_stroke_mm)
+                    stroke_children.append(child)
+
+            # Apply scale compensation to achieve target stroke width
+            # (the hole group's scale is computed once for all its children)
+            apply_stroke_compensation_batch(hole_group, stroke_children, TARGET_STROKE_MM)
 
         # Apply strokes to greens in "bottom" area
         if bottom_group is not None:
+            bottom_greens = []
             for child in bottom_group:
                 child_id = child.get('id')
                 # Target green_XX_bottom elements
                 if child_id and child_id.startswith('green_') and child_id.endswith('_bottom'):
-                    # Apply scale compensation to achieve target stroke width
-                    cumulative_scale = get_cumulative_scale(child)
-                    if cumulative_scale <= 0:
-                        cumulative_scale = 1.0
-                    compensated_stroke_mm = TARGET_STROKE_MM / cumulative_scale
-                    set_stroke_recursive(child, compensated_stroke_mm)
+                    bottom_greens.append(child)
+            apply_stroke_compensation_batch(bottom_group, bottom_greens, TARGET_STROKE_MM)
 
         # Report results
         if len(processed_holes) > 0:
@@ -248,19 +251,45 @@ class AutoPlaceHoles(inkex.EffectExtension):
         if len(failed_holes) > 0:
             inkex.errormsg(f"Failed to process {len(failed_holes)} holes: {', '.join(failed_holes)}")
 
+    def _index_groups(self, root: inkex.SvgDocumentElement) -> None:
+        """
+        Build ID and label lookups for all groups in a single pass over the document.
+
+        Labels are lowercased; when several groups share an ID or label, the first
+        one in document order is kept, matching the previous linear searches.
+        An exact-case index additionally keeps every group per label, in document
+        order, for lookups that must match the label exactly and try each group.
+        Groups are only moved (never created or relabelled) while holes are
+        processed, so the index stays valid for the whole run.
+
+        Args:
+            root: SVG root element
+
+        Side Effects:
+            - Sets self._groups_by_id
+            - Sets self._groups_by_label
+            - Sets self._groups_by_exact_label (label -> list of groups)
+        """
+        self._groups_by_id = {}
+        self._groups_by_label = {}
+        self._groups_by_exact_label = {}
+        for element in root.iter():
+            if isinstance(element, Group):
+                element_id = element.get('id')
+                if element_id:
+                    self._groups_by_id.setdefault(element_id, element)
+                label = element.label
+                if label:
+                    self._groups_by_label.setdefault(label.lower(), element)
+                    self._groups_by_exact_label.setdefault(label, []).append(element)
+
     def _find_hole_group(self, root: inkex.SvgDocumentElement, hole_id: str) -> Optional[Group]:
         """Find a hole group by its ID or label."""
-        element = root.getElementById(hole_id)
-        if element is not None and isinstance(element, Group):
+        element = self._groups_by_id.get(hole_id)
+        if element is not None:
             return element
 
-        for elem in root.iter():
-            if isinstance(elem, Group):
-                label = elem.label
-                if label and label.lower() == hole_id.lower():
-                    return elem
-
-        return None
+        return self._groups_by_label.get(hole_id.lower())
 
     def _process_hole(self, hole_group: Group, hole_num: int) -> None:
         """Process a single hole: rotate, scale, and position within bounding box."""
@@ -294,9 +323,7 @@ class AutoPlaceHoles(inkex.EffectExtension):
         )
 
         # Build rotation transform
-        rotation_transform = Transform(translate=(hole_center_x, hole_center_y))
-        rotation_transform @= Transform(rotate=rotation_angle)
-        rotation_transform @= Transform(translate=(-hole_center_x, -hole_center_y))
+        rotation_transform = Transform(rotate=(rotation_angle, hole_center_x, hole_center_y))
 
         # Apply rotation only first
         hole_group.transform = rotation_transform
@@ -306,8 +333,9 @@ class AutoPlaceHoles(inkex.EffectExtension):
 
         if measured_bbox:
             # Get target bounding box dimensions in user units
-            bbox_width = self.svg.unittouu(f"{self.BOUNDING_BOX['width']}in")
-            bbox_height = self.svg.unittouu(f"{self.BOUNDING_BOX['height']}in")
+            uu_per_inch = self._uu_per_inch
+            bbox_width = self.BOUNDING_BOX['width'] * uu_per_inch
+            bbox_height = self.BOUNDING_BOX['height'] * uu_per_inch
 
             # Calculate scale factors
             scale_x = bbox_width / measured_bbox.width if measured_bbox.width > 0 else 1.0
@@ -321,44 +349,62 @@ class AutoPlaceHoles(inkex.EffectExtension):
             measured_center_x = (measured_bbox.left + measured_bbox.right) / 2.0
             measured_center_y = (measured_bbox.top + measured_bbox.bottom) / 2.0
 
-            scale_transform = Transform(translate=(measured_center_x, measured_center_y))
-            scale_transform @= Transform(scale=calculated_scale)
-            scale_transform @= Transform(translate=(-measured_center_x, -measured_center_y))
+            scale_transform = self._scale_about(measured_center_x, measured_center_y, calculated_scale)
 
             final_transform = scale_transform @ hole_group.transform
             hole_group.transform = final_transform
 
-            # Measure scaled bbox and translate to target center
-            scaled_bbox = self._measure_terrain_via_temp_group(hole_group, hole_num)
+            # A uniform scale about the measured center keeps that center fixed and
+            # scales the bbox extents exactly, so the scaled and re-centred bboxes
+            # follow from the single measurement above instead of moving the
+            # terrain through a temp group twice more
+            scaled_half_width = measured_bbox.width * calculated_scale / 2.0
+
+            # Translate to target center
+            target_x = self.BOUNDING_BOX['x'] * uu_per_inch
+            target_y = self.BOUNDING_BOX['y'] * uu_per_inch
+            target_center_x = target_x + bbox_width / 2.0
+            target_center_y = target_y + bbox_height / 2.0
 
-            if scaled_bbox:
-                current_center_x = (scaled_bbox.left + scaled_bbox.right) / 2.0
-                current_center_y = (scaled_bbox.top + scaled_bbox.bottom) / 2.0
+            translate_x = target_center_x - measured_center_x
+            translate_y = target_center_y - measured_center_y
 
-                target_x = self.svg.unittouu(f"{self.BOUNDING_BOX['x']}in")
-                target_y = self.svg.unittouu(f"{self.BOUNDING_BOX['y']}in")
-                target_center_x = target_x + bbox_width / 2.0
-                target_center_y = target_y + bbox_height / 2.0
+            translate_transform = Transform(translate=(translate_x, translate_y))
+            final_transform = translate_transform @ hole_group.transform
+            hole_group.transform = final_transform
 
-                translate_x = target_center_x - current_center_x
-                translate_y = target_center_y - current_center_y
+            # Left-justify within target bounding box
+            centered_left = target_center_x - scaled_half_width
 
-                translate_transform = Transform(translate=(translate_x, translate_y))
-                final_transform = translate_transform @ hole_group.transform
-                hole_group.transform = final_transform
+            LEFT_BUFFER_INCHES = 0.5
+            left_buffer_uu = LEFT_BUFFER_INCHES * uu_per_inch
+            target_left_with_buffer = target_x + left_buffer_uu
+            left_shift = target_left_with_buffer - centered_left
 
-                # Left-justify within target bounding box
-                centered_bbox = self._measure_terrain_via_temp_group(hole_group, hole_num)
+            left_justify_transform = Transform(translate=(left_shift, 0))
+            final_transform = left_justify_transform @ hole_group.transform
+            hole_group.transform = final_transform
 
-                if centered_bbox:
-                    LEFT_BUFFER_INCHES = 0.5
-                    left_buffer_uu = self.svg.unittouu(f"{LEFT_BUFFER_INCHES}in")
-                    target_left_with_buffer = target_x + left_buffer_uu
-                    left_shift = target_left_with_buffer - centered_bbox.left
+    @staticmethod
+    def _scale_about(center_x: float, center_y: float, scale: float) -> Transform:
+        """
+        Build a uniform scale around a center point as a single matrix.
 
-                    left_justify_transform = Transform(translate=(left_shift, 0))
-                    final_transform = left_justify_transform @ hole_group.transform
-                    hole_group.transform = final_transform
+        Equivalent to translate(c) @ scale(s) @ translate(-c), without building
+        three transforms and multiplying them.
+
+        Args:
+            center_x: X coordinate of the fixed point
+            center_y: Y coordinate of the fixed point
+            scale: Uniform scale factor
+
+        Returns:
+            Transform: Scale about (center_x, center_y)
+        """
+        return Transform((
+            (scale, 0.0, center_x * (1.0 - scale)),
+            (0.0, scale, center_y * (1.0 - scale)),
+        ))
 
     def _find_green_element(self, hole_group: Group, hole_num: int) -> Optional[BaseElement]:
         """Find the green element within a hole group."""
@@ -425,10 +471,24 @@ class AutoPlaceHoles(inkex.EffectExtension):
         if len(bboxes) == 0:
             raise ValueError(f"Could not calculate bounding box for hole {hole_num}")
 
-        min_x = min(bbox.left if hasattr(bbox, 'left') else bbox.x.minimum for bbox in bboxes)
-        min_y = min(bbox.top if hasattr(bbox, 'top') else bbox.y.minimum for bbox in bboxes)
-        max_x = max(bbox.right if hasattr(bbox, 'right') else bbox.x.maximum for bbox in bboxes)
-        max_y = max(bbox.bottom if hasattr(bbox, 'bottom') else bbox.y.maximum for bbox in bboxes)
+        # Split the boxes into per-edge columns in one pass, then reduce each column
+        lefts, tops, rights, bottoms = [], [], [], []
+        for bbox in bboxes:
+            if hasattr(bbox, 'left'):
+                lefts.append(bbox.left)
+                tops.append(bbox.top)
+                rights.append(bbox.right)
+                bottoms.append(bbox.bottom)
+            else:
+                lefts.append(bbox.x.minimum)
+                tops.append(bbox.y.minimum)
+                rights.append(bbox.x.maximum)
+                bottoms.append(bbox.y.maximum)
+
+        min_x = min(lefts)
+        min_y = min(tops)
+        max_x = max(rights)
+        max_y = max(bottoms)
 
         width = max_x - min_x
         height = max_y - min_y
@@ -452,7 +512,7 @@ class AutoPlaceHoles(inkex.EffectExtension):
 
         # Collect terrain elements (green, fairways, bunkers)
         terrain_elements = []
-        for child in list(hole_group):
+        for child in hole_group:
             child_id = child.get('id')
             is_terrain = False
 
@@ -487,13 +547,7 @@ class AutoPlaceHoles(inkex.EffectExtension):
         Returns:
             Group or None: Bottom group if found
         """
-        for element in root.iter():
-            if isinstance(element, Group):
-                label = element.label
-                if label and label.lower() == 'bottom':
-                    return element
-
-        return None
+        return self._groups_by_label.get('bottom')
 
     def _find_green_with_parent(
         self,
@@ -516,19 +570,19 @@ class AutoPlaceHoles(inkex.EffectExtension):
         hole_label = f"hole_{hole_number:02d}"
         green_id = f"green_{hole_number:02d}"
 
-        # Search for hole group
-        for element in root.iter():
-            if isinstance(element, Group) and element.label == hole_label:
-                # Found hole group, search for green element at top level
-                # Greens are now at top level with ID green_XX (not in a subgroup)
-                for child in element:
-                    # Check for element with green ID
-                    element_id = child.get('id')
-                    if element_id and element_id == green_id:
-                        return (child, element)
-                    # Also check for green_XX_01, green_XX_02 pattern (multiple greens)
-                    if element_id and element_id.startswith(green_id):
-                        return (child, element)
+        # Check every group labelled exactly hole_XX, in document order, until
+        # one holds the green
+        for element in self._groups_by_exact_label.get(hole_label, ()):
+            # Found hole group, search for green element at top level
+            # Greens are now at top level with ID green_XX (not in a subgroup)
+            for child in element:
+                # Check for element with green ID
+                element_id = child.get('id')
+                if element_id and element_id == green_id:
+                    return (child, element)
+                # Also check for green_XX_01, green_XX_02 pattern (multiple greens)
+                if element_id and element_id.startswith(green_id):
+                    return (child, element)
 
         return (None, None)
 
@@ -573,10 +627,9 @@ class AutoPlaceHoles(inkex.EffectExtension):
         Strategy:
         1. Measure via temporary root-level group
         2. Calculate scale to fit target box with margin
-        3. Apply scale transform
-        4. Measure again to verify
-        5. Translate to target center
-        6. Apply stroke compensation
+        3. Apply scale transform around the measured center
+        4. Translate that (unchanged) center to the target center
+        5. Apply stroke compensation
 
         Args:
             green_copy: Copied green element (not yet positioned)
@@ -584,10 +637,11 @@ class AutoPlaceHoles(inkex.EffectExtension):
             hole_num: Hole number for logging
         """
         # Convert target box to user units
-        target_x = self.svg.unittouu(f"{self.TARGET_BOX['x']}in")
-        target_y = self.svg.unittouu(f"{self.TARGET_BOX['y']}in")
-        target_width = self.svg.unittouu(f"{self.TARGET_BOX['width']}in")
-        target_height = self.svg.unittouu(f"{self.TARGET_BOX['height']}in")
+        uu_per_inch = self._uu_per_inch
+        target_x = self.TARGET_BOX['x'] * uu_per_inch
+        target_y = self.TARGET_BOX['y'] * uu_per_inch
+        target_width = self.TARGET_BOX['width'] * uu_per_inch
+        target_height = self.TARGET_BOX['height'] * uu_per_inch
 
         # Apply hole group transform to the green copy first
         green_copy.transform = hole_group_transform @ green_copy.transform
@@ -606,6 +660,20 @@ class AutoPlaceHoles(inkex.EffectExtension):
         current_center_x = (bbox_left + bbox_right) / 2.0
         current_center_y = (bbox_top + bbox_bottom) / 2.0
 
+        # Target center of the bottom box
+        target_center_x = target_x + target_width / 2.0
+        target_center_y = target_y + target_height / 2.0
+
+        # Degenerate green (zero-size bbox): scaling cannot change it, so skip
+        # the scale transform
+        if bbox_width == 0 and bbox_height == 0:
+            logger.debug("Green %d has a degenerate bounding box, translating only", hole_num)
+            translate_transform = Transform(
+                translate=(target_center_x - current_center_x, target_center_y - current_center_y)
+            )
+            green_copy.transform = translate_transform @ green_copy.transform
+            return
+
         # Calculate scale factors
         scale_x = target_width / bbox_width if bbox_width > 0 else 1.0
         scale_y = target_height / bbox_height if bbox_height > 0 else 1.0
@@ -614,32 +682,17 @@ class AutoPlaceHoles(inkex.EffectExtension):
         scale_factor = min(scale_x, scale_y) * self.GREEN_EDGE_BUFFER
 
         # Apply scale transform around measured center
-        scale_transform = Transform(translate=(current_center_x, current_center_y))
-        scale_transform @= Transform(scale=scale_factor)
-        scale_transform @= Transform(translate=(-current_center_x, -current_center_y))
+        scale_transform = self._scale_about(current_center_x, current_center_y, scale_factor)
 
         green_copy.transform = scale_transform @ green_copy.transform
 
-        # Measure scaled bbox
-        scaled_bbox = self._measure_green_via_temp_group(green_copy, Transform(), hole_num)
-        if scaled_bbox is None:
-            logger.warning("Could not measure scaled bounding box for green %d", hole_num)
-            return
-
-        scaled_left, scaled_right, scaled_top, scaled_bottom = scaled_bbox.left, scaled_bbox.right, scaled_bbox.top, scaled_bbox.bottom
-        scaled_center_x = (scaled_left + scaled_right) / 2.0
-        scaled_center_y = (scaled_top + scaled_bottom) / 2.0
-
-        # Translate to target center
-        target_center_x = target_x + target_width / 2.0
-        target_center_y = target_y + target_height / 2.0
-
-        translate_x = target_center_x - scaled_center_x
-        translate_y = target_center_y - scaled_center_y
+        # Scaling about the measured center leaves that center in place, so the
+        # green can be translated to the target center without measuring again
+        translate_x = target_center_x - current_center_x
+        translate_y = target_center_y - current_center_y
 
         translate_transform = Transform(translate=(translate_x, translate_y))
         green_copy.transform = translate_transform @ green_copy.transform
 
-
 if __name__ == '__main__':
     AutoPlaceHoles().run()
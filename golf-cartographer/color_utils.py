@@ -16,6 +16,7 @@ License: MIT
 """
 from __future__ import annotations
 
+import functools
 import logging
 from typing import TYPE_CHECKING, Optional, Tuple, Dict, Any
 
@@ -76,6 +77,18 @@ COLORS: Dict[str, ColorDefinition] = {
 }
 
 
+# Order in which categorize_element_by_color checks categories
+CATEGORY_ORDER: Tuple[str, ...] = (
+    "mapping_line",
+    "path_line",
+    "green",
+    "fairway",
+    "bunker",
+    "water",
+    "tree",
+)
+
+
 def parse_color(color_string: str) -> Optional[RGB]:
     """
     Parse a color string into RGB tuple.
@@ -147,7 +160,16 @@ def check_color_match(
     if style is None:
         return False
 
-    color_value = style.get(style_attr)
+    return _color_value_matches(style.get(style_attr), target_rgb, tolerance, style_attr)
+
+
+def _color_value_matches(
+    color_value: Any,
+    target_rgb: RGB,
+    tolerance: int,
+    style_attr: str,
+) -> bool:
+    """Check a raw fill/stroke value against target RGB within tolerance."""
     if color_value is None:
         return False
 
@@ -246,29 +268,55 @@ def categorize_element_by_color(element: BaseElement) -> str:
         Category string: 'green', 'fairway', 'bunker', 'water', 'tree',
                         'mapping_line', 'path_line', or 'other'
     """
-    # Check in priority order - mapping_line and path_line first
-    # because they use stroke instead of fill
-    if is_color_category(element, "mapping_line"):
-        return "mapping_line"
+    style = element.style
+    if style is None:
+        return "other"
 
-    if is_color_category(element, "path_line"):
-        return "path_line"
+    # Only the fill and stroke values decide the category, so the result is
+    # cached per (fill, stroke) pair - golf maps use a handful of colors
+    return _categorize_colors(
+        _color_cache_key(style.get("fill")),
+        _color_cache_key(style.get("stroke")),
+    )
 
-    # Check fill-based categories
-    if is_color_category(element, "green"):
-        return "green"
 
-    if is_color_category(element, "fairway"):
-        return "fairway"
+def _color_cache_key(color_value: Any) -> Optional[str]:
+    """Normalize a style color value into a hashable cache key."""
+    if color_value is None:
+        return None
+    return str(color_value)
+
 
-    if is_color_category(element, "bunker"):
-        return "bunker"
+@functools.lru_cache(maxsize=256)
+def _categorize_colors(fill: Optional[str], stroke: Optional[str]) -> str:
+    """
+    Categorize a fill/stroke color pair (cached helper for categorize_element_by_color).
 
-    if is_color_category(element, "water"):
-        return "water"
+    Args:
+        fill: Fill color string, or None if unset
+        stroke: Stroke color string, or None if unset
 
-    if is_color_category(element, "tree"):
-        return "tree"
+    Returns:
+        Category string, or 'other' if no category matches
+    """
+    values = {"fill": fill, "stroke": stroke}
+
+    # Check in priority order - mapping_line and path_line first
+    # because they use stroke instead of fill
+    for category in CATEGORY_ORDER:
+        color_def = COLORS[category]
+
+        # Handle special case: mapping_line requires fill:none
+        if color_def.get("requires_no_fill", False) and fill is not None and fill != "none":
+            continue
+
+        if _color_value_matches(
+            values[color_def["style_attr"]],
+            color_def["rgb"],
+            color_def["tolerance"],
+            color_def["style_attr"],
+        ):
+            return category
 
     return "other"
 
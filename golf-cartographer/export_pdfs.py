@@ -28,10 +28,13 @@ License: MIT
 """
 
 import inkex
+import io
 import os
+import re
+import shutil
 import sys
 import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add python_libraries to path (for bundled pypdf)
 lib_path = os.path.join(os.path.dirname(__file__), 'python_libraries')
@@ -39,6 +42,62 @@ sys.path.insert(0, lib_path)
 
 from pypdf import PdfWriter, PdfReader
 
+# Elements whose content Inkscape rasterizes when exporting to PDF
+RASTER_TAGS = (
+    '{http://www.w3.org/2000/svg}image',
+    '{http://www.w3.org/2000/svg}filter',
+)
+
+# Style declarations rewritten when toggling page visibility (matched only at
+# the start of a declaration, so e.g. "-inkscape-display" is left alone)
+_DISPLAY_DECL_RE = re.compile(r'(?:^|(?<=;))\s*display\s*:[^;]*;?')
+_DISPLAY_VISIBILITY_DECL_RE = re.compile(r'(?:^|(?<=;))\s*(?:display|visibility)\s*:[^;]*;?')
+HIDDEN_STYLE = 'display:none'
+VISIBLE_STYLE = 'display:inline;visibility:visible'
+
+# All 20 individual narrow page exports (4.25" x 14" each), built once at import
+# Format: (top_element, bottom_element, special_top, special_bottom)
+# Using top-bottom notation: "9-9" means hole 9 layout with green 9
+INDIVIDUAL_PAGE_CONFIGS = (
+    # Pages 1-10
+    ("hole_09", "hole_09", False, False),           # 1. 9-9
+    ("hole_08", "hole_10", False, False),           # 2. 8-10
+    ("hole_07", "hole_11", False, False),           # 3. 7-11
+    ("hole_06", "hole_12", False, False),           # 4. 6-12
+    ("hole_05", "hole_13", False, False),           # 5. 5-13
+    ("hole_04", "hole_14", False, False),           # 6. 4-14
+    ("hole_03", "hole_15", False, False),           # 7. 3-15
+    ("hole_02", "hole_16", False, False),           # 8. 2-16
+    ("hole_01", "hole_17", False, False),           # 9. 1-17
+    ("yardage_chart", "hole_18", True, False),      # 10. yardage_chart-18
+    # Pages 11-20
+    ("hole_10", "hole_08", False, False),           # 11. 10-8
+    ("hole_11", "hole_07", False, False),           # 12. 11-7
+    ("hole_12", "hole_06", False, False),           # 13. 12-6
+    ("hole_13", "hole_05", False, False),           # 14. 13-5
+    ("hole_14", "hole_04", False, False),           # 15. 14-4
+    ("hole_15", "hole_03", False, False),           # 16. 15-3
+    ("hole_16", "hole_02", False, False),           # 17. 16-2
+    ("hole_17", "hole_01", False, False),           # 18. 17-1
+    ("hole_18", "notes", False, True),              # 19. 18-notes
+    ("back", "cover", True, True),                  # 20. back-cover
+)
+
+# How to combine into 10 full-width pages (side-by-side pairs)
+# Combine sequential pairs: 1+2, 3+4, 5+6, etc.
+PAGE_COMBINATIONS = (
+    (0, 1),    # Wide Page 1: narrow pages 1+2
+    (2, 3),    # Wide Page 2: narrow pages 3+4
+    (4, 5),    # Wide Page 3: narrow pages 5+6
+    (6, 7),    # Wide Page 4: narrow pages 7+8
+    (8, 9),    # Wide Page 5: narrow pages 9+10
+    (10, 11),  # Wide Page 6: narrow pages 11+12
+    (12, 13),  # Wide Page 7: narrow pages 13+14
+    (14, 15),  # Wide Page 8: narrow pages 15+16
+    (16, 17),  # Wide Page 9: narrow pages 17+18
+    (18, 19),  # Wide Page 10: narrow pages 19+20
+)
+
 
 class InkscapeExportError(RuntimeError):
     """Raised when Inkscape CLI operations fail."""
@@ -61,6 +120,10 @@ class ExportPDFs(inkex.EffectExtension):
                          help="Combine individual PDFs into printable booklet format")
         pars.add_argument("--keep_narrow_pdfs", type=inkex.Boolean, default=False,
                          help="Keep original 20 narrow PDFs (4.25\" x 14\")")
+        pars.add_argument("--jobs", type=int, default=0,
+                         help="Number of Inkscape exports to run in parallel (0 = one per CPU)")
+        pars.add_argument("--raster_dpi", type=int, default=300,
+                         help="Resolution for rasterized content (images, filters)")
 
     def effect(self):
         """
@@ -71,8 +134,8 @@ class ExportPDFs(inkex.EffectExtension):
         2. Detect Inkscape CLI path for PDF generation
         3. Create output subdirectories (exports/ and print/)
         4. Export 20 individual narrow PDFs (4.25" x 14" each) to exports/:
-           - Configure visibility for each top/bottom pairing
-           - Export to PDF at 300 DPI
+           - Configure visibility for each top/bottom pairing and snapshot it
+           - Export the snapshots to PDF at 300 DPI, several Inkscape processes at a time
         5. If combine_booklets is enabled:
            - Combine pairs side-by-side into 10 full-width pages (8.5" x 14")
            - Combine 10 wide pages into 5 booklet PDFs (2 pages each) in print/
@@ -97,12 +160,21 @@ class ExportPDFs(inkex.EffectExtension):
         self.yardage_chart_group = validation_result["yardage_chart"]
         self.greens_guide_group = validation_result["greens_guide"]
 
+        # Toggleable children indexed by label during validation, so configuring
+        # each page is a dictionary lookup instead of a scan over every child
+        self.top_holes = validation_result["top_holes"]
+        self.bottom_greens = validation_result["bottom_greens"]
+
         # Detect Inkscape CLI path
         inkscape_path = self._find_inkscape_cli()
         if not inkscape_path:
             inkex.errormsg("Inkscape CLI not found. Please ensure Inkscape is installed and in your PATH.")
             return
 
+        # Only pass an export resolution when something will be rasterized;
+        # a purely vector document is exported without the raster fallback
+        raster_dpi = self.options.raster_dpi if self._has_raster_content() else None
+
         # Expand output directory path (handle ~)
         output_dir = os.path.expanduser(self.options.output_dir)
         if not os.path.exists(output_dir):
@@ -127,78 +199,57 @@ class ExportPDFs(inkex.EffectExtension):
         successful_exports = []
         failed_exports = []
 
-        # Store original visibility states for restoration
-        original_states = self._save_visibility_states()
-
-        # Step 1: Define all 20 individual narrow page exports (4.25" x 14" each)
-        # Format: (top_element, bottom_element, special_top, special_bottom)
-        # Using top-bottom notation: "9-9" means hole 9 layout with green 9
-        individual_page_configs = [
-            # Pages 1-10
-            ("hole_09", "hole_09", False, False),           # 1. 9-9
-            ("hole_08", "hole_10", False, False),           # 2. 8-10
-            ("hole_07", "hole_11", False, False),           # 3. 7-11
-            ("hole_06", "hole_12", False, False),           # 4. 6-12
-            ("hole_05", "hole_13", False, False),           # 5. 5-13
-            ("hole_04", "hole_14", False, False),           # 6. 4-14
-            ("hole_03", "hole_15", False, False),           # 7. 3-15
-            ("hole_02", "hole_16", False, False),           # 8. 2-16
-            ("hole_01", "hole_17", False, False),           # 9. 1-17
-            ("yardage_chart", "hole_18", True, False),      # 10. yardage_chart-18
-            # Pages 11-20
-            ("hole_10", "hole_08", False, False),           # 11. 10-8
-            ("hole_11", "hole_07", False, False),           # 12. 11-7
-            ("hole_12", "hole_06", False, False),           # 13. 12-6
-            ("hole_13", "hole_05", False, False),           # 14. 13-5
-            ("hole_14", "hole_04", False, False),           # 15. 14-4
-            ("hole_15", "hole_03", False, False),           # 16. 15-3
-            ("hole_16", "hole_02", False, False),           # 17. 16-2
-            ("hole_17", "hole_01", False, False),           # 18. 17-1
-            ("hole_18", "notes", False, True),              # 19. 18-notes
-            ("back", "cover", True, True),                  # 20. back-cover
-        ]
+        # Original style attributes of every element whose visibility gets
+        # changed, recorded on first change and restored afterwards
+        self._original_styles = {}
 
-        # Step 2: Define how to combine into 10 full-width pages (side-by-side pairs)
-        # Combine sequential pairs: 1+2, 3+4, 5+6, etc.
-        page_combinations = [
-            (0, 1),    # Wide Page 1: narrow pages 1+2
-            (2, 3),    # Wide Page 2: narrow pages 3+4
-            (4, 5),    # Wide Page 3: narrow pages 5+6
-            (6, 7),    # Wide Page 4: narrow pages 7+8
-            (8, 9),    # Wide Page 5: narrow pages 9+10
-            (10, 11),  # Wide Page 6: narrow pages 11+12
-            (12, 13),  # Wide Page 7: narrow pages 13+14
-            (14, 15),  # Wide Page 8: narrow pages 15+16
-            (16, 17),  # Wide Page 9: narrow pages 17+18
-            (18, 19),  # Wide Page 10: narrow pages 19+20
-        ]
+        # Warnings and non-fatal errors raised while exporting, reported
+        # together with the summary instead of one stderr write each
+        self._messages = []
 
         try:
             # Step 1: Export 20 individual narrow PDFs (4.25" x 14" each)
+            # Visibility is configured and each page serialized in memory one
+            # after another (the document tree is not thread-safe); each page
+            # is handed to the pool as soon as it is serialized, so Inkscape
+            # renders earlier pages while later ones are still being prepared
             individual_pdf_paths = []
-            for idx, (top, bottom, special_top, special_bottom) in enumerate(individual_page_configs, 1):
-                filename = self._generate_narrow_filename(top, bottom, special_top, special_bottom)
-                output_path = os.path.join(exports_dir, filename)
-                individual_pdf_paths.append(output_path)
+            futures = {}  # future -> filename
+            max_workers = self.options.jobs if self.options.jobs > 0 else (os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                self._hide_all_pages()
+                for idx, (top, bottom, special_top, special_bottom) in enumerate(INDIVIDUAL_PAGE_CONFIGS, 1):
+                    filename = self._generate_narrow_filename(top, bottom, special_top, special_bottom)
+                    output_path = os.path.join(exports_dir, filename)
+                    individual_pdf_paths.append(output_path)
 
-                try:
-                    self._configure_visibility(top, bottom, special_top, special_bottom)
-                    self._export_to_pdf(inkscape_path, output_path)
-                    successful_exports.append(filename)
-                except Exception as e:
-                    failed_exports.append((filename, str(e)))
-                    inkex.errormsg(f"Failed to export {filename}: {e}")
+                    try:
+                        self._configure_visibility(top, bottom, special_top, special_bottom)
+                        svg_bytes = self._snapshot_svg()
+                    except Exception as e:
+                        failed_exports.append((filename, str(e)))
+                        continue
+                    future = executor.submit(self._export_to_pdf, inkscape_path, svg_bytes, output_path, raster_dpi)
+                    futures[future] = filename
+
+                for future in as_completed(futures):
+                    filename = futures[future]
+                    try:
+                        future.result()
+                        successful_exports.append(filename)
+                    except Exception as e:
+                        failed_exports.append((filename, str(e)))
 
             # Step 2: Combine pairs side-by-side into 10 full-width pages (8.5" x 14" each)
             combined_page_paths = []
             if self.options.combine_booklets and len(individual_pdf_paths) == 20:
-                for idx, (left_idx, right_idx) in enumerate(page_combinations, 1):
+                for idx, (left_idx, right_idx) in enumerate(PAGE_COMBINATIONS, 1):
                     left_path = individual_pdf_paths[left_idx]
                     right_path = individual_pdf_paths[right_idx]
 
                     if os.path.exists(left_path) and os.path.exists(right_path):
-                        left_config = individual_page_configs[left_idx]
-                        right_config = individual_page_configs[right_idx]
+                        left_config = INDIVIDUAL_PAGE_CONFIGS[left_idx]
+                        right_config = INDIVIDUAL_PAGE_CONFIGS[right_idx]
                         combined_filename = self._generate_wide_filename(left_config, right_config)
                         combined_path = os.path.join(output_dir, combined_filename)
 
@@ -206,7 +257,7 @@ class ExportPDFs(inkex.EffectExtension):
                             self._combine_side_by_side(left_path, right_path, combined_path)
                             combined_page_paths.append(combined_path)
                         except Exception as e:
-                            inkex.errormsg(f"Failed to combine {combined_filename}: {e}")
+                            self._messages.append(f"Failed to combine {combined_filename}: {e}")
 
                 # Clean up individual narrow PDFs after combining (unless user wants to keep them)
                 if not self.options.keep_narrow_pdfs:
@@ -232,7 +283,7 @@ class ExportPDFs(inkex.EffectExtension):
 
         finally:
             # Restore original visibility states
-            self._restore_visibility_states(original_states)
+            self._restore_visibility_states()
 
         # Clean up empty directories
         try:
@@ -268,6 +319,10 @@ class ExportPDFs(inkex.EffectExtension):
             summary += "\nFailed exports:\n"
             for filename, error in failed_exports:
                 summary += f"  - {filename}: {error}\n"
+        if self._messages:
+            summary += "\nWarnings:\n"
+            for message in self._messages:
+                summary += f"  - {message}\n"
         summary += f"\n"
         if os.path.exists(exports_dir):
             summary += f"  Narrow PDFs: {exports_dir}\n"
@@ -333,7 +388,8 @@ class ExportPDFs(inkex.EffectExtension):
         Validate that document contains all required groups.
 
         Returns:
-            dict: Contains 'valid' (bool), 'error' (str), and group references
+            dict: Contains 'valid' (bool), 'error' (str), group references, and
+                'top_holes' / 'bottom_greens' mappings of label to child element
         """
         root = self.document.getroot()
 
@@ -368,16 +424,35 @@ class ExportPDFs(inkex.EffectExtension):
         # Also find greens_guide (optional, in bottom group)
         greens_guide = None
 
-        # Search in both top and bottom groups
+        # Index hole_XX children of top and green_XX_bottom children of bottom
+        # by label in the same pass, for _configure_visibility()
+        top_holes = {}
+        bottom_greens = {}
+        hole_count = 0
+        green_count = 0
+
+        # Search in both top and bottom groups, walking each child list once
         for parent_group in [root_groups["top"], root_groups["bottom"]]:
+            is_top = parent_group is root_groups["top"]
             for child in parent_group:
-                if isinstance(child, inkex.Group):
-                    label = child.label
+                label = child.label
+                is_group = isinstance(child, inkex.Group)
+                if is_group:
                     if label in special_groups and special_groups[label] is None:
                         special_groups[label] = child
                     elif label == "greens_guide":
                         greens_guide = child
 
+                if not label:
+                    continue
+                if is_top:
+                    if is_group and label.startswith("hole_"):
+                        hole_count += 1
+                        top_holes.setdefault(label, child)
+                elif label.startswith("green_") and label.endswith("_bottom"):
+                    green_count += 1
+                    bottom_greens.setdefault(label, child)
+
         # Check for missing special groups
         missing_special = [name for name, group in special_groups.items() if group is None]
         if missing_special:
@@ -387,12 +462,6 @@ class ExportPDFs(inkex.EffectExtension):
             return {"valid": False, "error": error_msg}
 
         # Validate top group has 18 hole_XX children
-        top_group = root_groups["top"]
-        hole_count = 0
-        for child in top_group:
-            if isinstance(child, inkex.Group) and child.label and child.label.startswith("hole_"):
-                hole_count += 1
-
         if hole_count < 18:
             return {
                 "valid": False,
@@ -400,12 +469,6 @@ class ExportPDFs(inkex.EffectExtension):
             }
 
         # Validate bottom group has 18 green_XX_bottom children
-        bottom_group = root_groups["bottom"]
-        green_count = 0
-        for child in bottom_group:
-            if child.label and child.label.startswith("green_") and child.label.endswith("_bottom"):
-                green_count += 1
-
         if green_count < 18:
             return {
                 "valid": False,
@@ -417,18 +480,26 @@ class ExportPDFs(inkex.EffectExtension):
         result.update(root_groups)
         result.update(special_groups)
         result["greens_guide"] = greens_guide
+        result["top_holes"] = top_holes
+        result["bottom_greens"] = bottom_greens
         return result
 
     def _find_inkscape_cli(self):
         """
         Detect Inkscape CLI path across different platforms.
 
-        Searches common installation paths for each OS and falls back to
-        checking the system PATH if standard locations are not found.
+        Honors an INKSCAPE environment variable pointing at the binary, then
+        searches common installation paths for each OS and falls back to
+        searching the system PATH if standard locations are not found.
 
         Returns:
             str: Path to Inkscape CLI binary or None if not found
         """
+        # Explicit override (scripted runs, non-standard installs)
+        env_path = os.environ.get('INKSCAPE')
+        if env_path and os.path.exists(env_path):
+            return env_path
+
         paths = []
 
         # Define platform-specific search paths for Inkscape installation
@@ -456,91 +527,80 @@ class ExportPDFs(inkex.EffectExtension):
             if os.path.exists(path):
                 return path
 
-        # Fallback: check system PATH by running 'inkscape --version'
-        # This covers cases where Inkscape is in user's PATH or environment
-        try:
-            result = subprocess.run(['inkscape', '--version'],
-                                   capture_output=True,
-                                   timeout=5)
-            if result.returncode == 0:
-                return 'inkscape'
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-
-        return None
+        # Fallback: look 'inkscape' up on the system PATH
+        # This covers cases where Inkscape is in user's PATH or environment;
+        # a PATH lookup only stats files, whereas running 'inkscape --version'
+        # starts Inkscape and can take around a second
+        return shutil.which('inkscape')
 
-    def _save_visibility_states(self):
+    def _has_raster_content(self):
         """
-        Save current visibility states of all groups and their children.
+        Check whether the document contains images or filters.
 
         Returns:
-            dict: Mapping of element IDs to their visibility states
+            bool: True if any element would be rasterized in the PDF export
         """
-        states = {}
+        for _ in self.document.getroot().iter(*RASTER_TAGS):
+            return True
+        return False
 
-        groups_to_check = [
-            self.top_group,
-            self.bottom_group,
-            self.notes_group,
-            self.cover_group,
-            self.back_group,
-            self.yardage_chart_group
-        ]
-
-        for group in groups_to_check:
-            # Save group state
-            element_id = group.get('id')
-            if element_id:
-                states[element_id] = self._get_visibility_state(group)
-
-            # Save children states
-            for child in group:
-                child_id = child.get('id')
-                if child_id:
-                    states[child_id] = self._get_visibility_state(child)
-
-        return states
-
-    def _get_visibility_state(self, element):
+    def _remember_style(self, element):
         """
-        Get visibility state of an element.
+        Record an element's original style attribute before its first change.
 
         Args:
-            element: SVG element
+            element: SVG element about to be shown or hidden
+        """
+        if element not in self._original_styles:
+            self._original_styles[element] = element.get('style')
 
-        Returns:
-            dict: Contains 'display' and 'visibility' style properties
+    def _restore_visibility_states(self):
         """
-        style = element.style if element.style else inkex.Style()
-        return {
-            'display': style.get('display', 'inline'),
-            'visibility': style.get('visibility', 'visible')
-        }
+        Restore the original style attribute of every element that was changed.
+        """
+        for element, style in self._original_styles.items():
+            if style is None:
+                element.attrib.pop('style', None)
+            else:
+                element.set('style', style)
+        self._original_styles.clear()
 
-    def _restore_visibility_states(self, states):
+    def _hide_all_pages(self):
         """
-        Restore visibility states of elements.
+        Hide every hole, green and special page group once before the page loop.
 
-        Args:
-            states: dict mapping element IDs to visibility states
+        Resets the record of what is shown, so _configure_visibility() can
+        start toggling only the elements that change from page to page.
         """
-        root = self.document.getroot()
+        self._hide_all_holes(self.top_holes)
+        self._hide_all_greens(self.bottom_greens)
+
+        # Hide all special page groups
+        self._hide_element(self.notes_group)
+        self._hide_element(self.cover_group)
+        self._hide_element(self.back_group)
+        self._hide_element(self.yardage_chart_group)
+
+        self._shown_top = None
+        self._shown_bottom = None
+        self._greens_guide_shown = None
 
-        for element_id, state in states.items():
-            element = self.svg.getElementById(element_id)
-            if element is not None:
-                if element.style is None:
-                    element.style = inkex.Style()
-                element.style['display'] = state['display']
-                element.style['visibility'] = state['visibility']
+        # Every element that shows one page's content, for _snapshot_svg()
+        self._page_elements = (
+            list(self.top_holes.values())
+            + list(self.bottom_greens.values())
+            + [self.notes_group, self.cover_group, self.back_group, self.yardage_chart_group]
+        )
 
     def _configure_visibility(self, top_visible, bottom_visible,
                             special_top=False, special_bottom=False):
         """
         Configure visibility for top and bottom groups plus special groups.
 
-        Hides everything first, then shows only the specified elements.
-        This ensures each PDF page contains exactly one top and one bottom element.
+        Only the elements that differ from the previous page are toggled:
+        the previously shown top/bottom element is hidden and the new one shown.
+        This relies on _hide_all_pages() having run first, and still ensures
+        each PDF page contains exactly one top and one bottom element.
 
         Args:
             top_visible: Label of element to show in top group (or special group name)
@@ -548,41 +608,23 @@ class ExportPDFs(inkex.EffectExtension):
             special_top: If True, top_visible refers to a special group (not a hole)
             special_bottom: If True, bottom_visible refers to a special group (not a hole)
         """
-        # First pass: hide everything to ensure clean slate
-        # This prevents accidentally showing multiple holes in the same PDF
-        self._hide_all_holes(self.top_group)
-        self._hide_all_greens(self.bottom_group)
-
-        # Hide all special page groups
-        self._hide_element(self.notes_group)
-        self._hide_element(self.cover_group)
-        self._hide_element(self.back_group)
-        self._hide_element(self.yardage_chart_group)
-
-        # Second pass: show only the specified top element
+        # Resolve the top element
         # If special_top is True, top_visible is a special group name (e.g., "back", "yardage_chart")
         # Otherwise, top_visible is a hole label (e.g., "hole_01", "hole_18")
         if special_top:
-            # Show special group directly
-            if top_visible == "back":
-                self._show_element_direct(self.back_group)
-            elif top_visible == "yardage_chart":
-                self._show_element_direct(self.yardage_chart_group)
+            top_element = {
+                "back": self.back_group,
+                "yardage_chart": self.yardage_chart_group,
+            }.get(top_visible)
         else:
-            # Show hole in top group (hole_XX format)
-            self._show_element_in_group(self.top_group, top_visible)
+            top_element = self._find_in_group(self.top_group, self.top_holes, top_visible)
 
-        # Third pass: show only the specified bottom element
+        # Resolve the bottom element
         if special_bottom:
-            # Show special group directly and hide greens_guide
-            if bottom_visible == "cover":
-                self._show_element_direct(self.cover_group)
-                if self.greens_guide_group is not None:
-                    self._hide_element(self.greens_guide_group)
-            elif bottom_visible == "notes":
-                self._show_element_direct(self.notes_group)
-                if self.greens_guide_group is not None:
-                    self._hide_element(self.greens_guide_group)
+            bottom_element = {
+                "cover": self.cover_group,
+                "notes": self.notes_group,
+            }.get(bottom_visible)
         else:
             # Convert hole_XX to green_XX_bottom format for bottom group
             # e.g., "hole_01" -> "green_01_bottom"
@@ -591,32 +633,52 @@ class ExportPDFs(inkex.EffectExtension):
                 green_label = f"green_{hole_num}_bottom"
             else:
                 green_label = bottom_visible
-            self._show_element_in_group(self.bottom_group, green_label)
-            # Ensure greens_guide is visible for regular pages and yardage_chart
-            if self.greens_guide_group is not None:
+            bottom_element = self._find_in_group(self.bottom_group, self.bottom_greens, green_label)
+
+        # Swap the shown elements only where they changed since the last page
+        if top_element is not self._shown_top:
+            if self._shown_top is not None:
+                self._hide_element(self._shown_top)
+            if top_element is not None:
+                self._show_element_direct(top_element)
+            self._shown_top = top_element
+
+        if bottom_element is not self._shown_bottom:
+            if self._shown_bottom is not None:
+                self._hide_element(self._shown_bottom)
+            if bottom_element is not None:
+                self._show_element_direct(bottom_element)
+            self._shown_bottom = bottom_element
+
+        # greens_guide is visible for regular pages and yardage_chart,
+        # hidden behind the cover and notes pages
+        show_greens_guide = not special_bottom
+        if self.greens_guide_group is not None and show_greens_guide != self._greens_guide_shown:
+            if show_greens_guide:
                 self._show_element_direct(self.greens_guide_group)
+            else:
+                self._hide_element(self.greens_guide_group)
+            self._greens_guide_shown = show_greens_guide
 
-    def _hide_all_holes(self, group):
+    def _hide_all_holes(self, holes):
         """
-        Hide all hole_XX children in a group.
+        Hide all hole_XX children of the top group.
 
         Args:
-            group: Parent group element
+            holes: Mapping of label to hole element (see _validate_document_structure)
         """
-        for child in group:
-            if isinstance(child, inkex.Group) and child.label and child.label.startswith("hole_"):
-                self._hide_element(child)
+        for child in holes.values():
+            self._hide_element(child)
 
-    def _hide_all_greens(self, group):
+    def _hide_all_greens(self, greens):
         """
-        Hide all green_XX_bottom children in a group.
+        Hide all green_XX_bottom children of the bottom group.
 
         Args:
-            group: Parent group element
+            greens: Mapping of label to green element (see _validate_document_structure)
         """
-        for child in group:
-            if child.label and child.label.startswith("green_") and child.label.endswith("_bottom"):
-                self._hide_element(child)
+        for child in greens.values():
+            self._hide_element(child)
 
     def _hide_element(self, element):
         """
@@ -625,9 +687,8 @@ class ExportPDFs(inkex.EffectExtension):
         Args:
             element: SVG element to hide
         """
-        if element.style is None:
-            element.style = inkex.Style()
-        element.style['display'] = 'none'
+        self._remember_style(element)
+        self._replace_style_declarations(element, _DISPLAY_DECL_RE, HIDDEN_STYLE)
 
     def _show_element_direct(self, element):
         """
@@ -636,108 +697,137 @@ class ExportPDFs(inkex.EffectExtension):
         Args:
             element: SVG element to show
         """
-        if element.style is None:
-            element.style = inkex.Style()
-        element.style['display'] = 'inline'
-        element.style['visibility'] = 'visible'
+        self._remember_style(element)
+        self._replace_style_declarations(element, _DISPLAY_VISIBILITY_DECL_RE, VISIBLE_STYLE)
 
-    def _show_element_in_group(self, group, label):
+    def _replace_style_declarations(self, element, pattern, declarations):
         """
-        Find and show a specific element by label within a group.
+        Swap declarations in an element's raw style attribute.
+
+        Edits the attribute string directly instead of parsing it into an
+        inkex.Style and serializing it back; all other properties are kept.
 
         Args:
-            group: Parent group to search in
-            label: Label of element to show
+            element: SVG element to update
+            pattern: Compiled regex matching the declarations to drop
+            declarations: Declarations to append (e.g. "display:none")
         """
-        for child in group:
-            if child.label == label:
-                self._show_element_direct(child)
-                return
+        rest = pattern.sub('', element.get('style') or '').strip().strip(';')
+        element.set('style', f"{rest};{declarations}" if rest else declarations)
 
-        # If not found, log warning but continue
-        inkex.errormsg(f"Warning: Element with label '{label}' not found in group '{group.label}'")
+    def _find_in_group(self, group, children, label):
+        """
+        Look up a specific element by label within a group.
 
-    def _export_to_pdf(self, inkscape_path, output_path):
+        Args:
+            group: Parent group (used for the warning message)
+            children: Mapping of label to child element (see _validate_document_structure)
+            label: Label of element to find
+
+        Returns:
+            The matching element, or None if the label is not in the group
         """
-        Export document to PDF using Inkscape CLI.
+        try:
+            return children[label]
+        except KeyError:
+            # If not found, record a warning for the summary but continue
+            self._messages.append(f"Warning: Element with label '{label}' not found in group '{group.label}'")
+            return None
 
-        Creates temporary SVG files with the current document state
-        (including all visibility changes), converts strokes to paths
-        to ensure consistent printing across different PDF printers,
-        then exports to PDF and cleans up temp files.
+    def _snapshot_svg(self):
+        """
+        Serialize the current document state to bytes.
 
-        Args:
-            inkscape_path: Path to Inkscape CLI binary
-            output_path: Output PDF file path
+        The snapshot preserves all visibility changes made by _configure_visibility(),
+        so the page can be exported later while the document is reconfigured.
+        The bytes are piped straight to Inkscape by the export worker.
 
-        Raises:
-            InkscapeExportError: If Inkscape export or stroke-to-path conversion fails
+        Hidden page elements (every hole, green and special group not shown on
+        this page, and greens_guide when it is hidden) are detached from the
+        tree while serializing, so Inkscape only parses the content of a single
+        page. They are put back at their original positions afterwards.
+
+        Returns:
+            bytes: The serialized SVG document
         """
-        # Create temporary SVG files - close FDs immediately to prevent leaks
-        # This preserves all visibility changes made by _configure_visibility()
-        temp_original_fd, temp_original_path = tempfile.mkstemp(suffix='.svg', prefix='yardage_book_original_')
-        os.close(temp_original_fd)  # Close immediately to prevent FD leak if second mkstemp fails
+        hidden = list(self._page_elements)
+        if self.greens_guide_group is not None and not self._greens_guide_shown:
+            hidden.append(self.greens_guide_group)
 
-        temp_converted_fd, temp_converted_path = tempfile.mkstemp(suffix='.svg', prefix='yardage_book_converted_')
-        os.close(temp_converted_fd)  # Close immediately to prevent FD leak
+        detached = []  # (parent, index, element)
+        for element in hidden:
+            if element is self._shown_top or element is self._shown_bottom:
+                continue
+            parent = element.getparent()
+            if parent is not None:
+                detached.append((parent, parent.index(element), element))
 
         try:
-            # Write current document state to temp SVG file
-            # The document includes all the visibility manipulations for this specific PDF
-            with open(temp_original_path, 'wb') as f:
-                self.document.write(f)
-
-            # Convert strokes to paths in a separate temp file
-            # This prevents PDF printers from applying transforms to strokes inconsistently
-            # The conversion bakes all transforms into path geometry
-            try:
-                convert_result = subprocess.run([
-                    inkscape_path,
-                    temp_original_path,
-                    '--actions=select-all:all;object-stroke-to-path',
-                    f'--export-filename={temp_converted_path}',
-                    '--export-plain-svg',
-                    '--export-text-to-path'
-                ], capture_output=True, text=True, timeout=30)
-            except subprocess.TimeoutExpired:
-                raise InkscapeExportError(
-                    "Stroke-to-path conversion timed out after 30 seconds"
-                )
-
-            # Check if stroke-to-path conversion succeeded
-            if convert_result.returncode != 0:
-                error_msg = convert_result.stderr or convert_result.stdout or "Unknown error"
-                raise InkscapeExportError(f"Stroke-to-path conversion failed: {error_msg}")
-
-            # Call Inkscape CLI to export PDF from the converted SVG
-            # Using high DPI (300) for print-quality output
-            try:
-                export_result = subprocess.run([
-                    inkscape_path,
-                    temp_converted_path,
-                    '--export-type=pdf',
-                    f'--export-filename={output_path}',
-                    '--export-dpi=300'           # Print quality resolution
-                ], capture_output=True, text=True, timeout=30)
-            except subprocess.TimeoutExpired:
-                raise InkscapeExportError(
-                    "PDF export timed out after 30 seconds"
-                )
-
-            # Check if export succeeded
-            if export_result.returncode != 0:
-                error_msg = export_result.stderr or export_result.stdout or "Unknown error"
-                raise InkscapeExportError(f"PDF export failed: {error_msg}")
+            for parent, _, element in detached:
+                parent.remove(element)
 
+            buffer = io.BytesIO()
+            self.document.write(buffer)
+            return buffer.getvalue()
         finally:
-            # Clean up temporary SVG files
-            # Use try-except to ensure cleanup happens even if it fails
-            for temp_path in [temp_original_path, temp_converted_path]:
-                try:
-                    if os.path.exists(temp_path):
-                        os.unlink(temp_path)
-                except OSError:
-                    pass  # Silently ignore cleanup errors (temp files will be deleted by OS eventually)
+            # Reinsert in ascending index order so every element lands back
+            # at its original position among its siblings
+            for parent, index, element in sorted(detached, key=lambda item: item[1]):
+                parent.insert(index, element)
+
+    def _export_to_pdf(self, inkscape_path, svg_bytes, output_path, raster_dpi=300):
+        """
+        Export an SVG snapshot to PDF using Inkscape CLI.
+
+        Pipes the snapshot to Inkscape on stdin, converts strokes to paths to
+        ensure consistent printing across different PDF printers, then exports
+        to PDF - both in a single Inkscape process, so its startup cost is paid
+        once per page and no temporary SVG file is written.
+
+        Only touches files, never the document, so several exports can run
+        in parallel threads.
+
+        Args:
+            inkscape_path: Path to Inkscape CLI binary
+            svg_bytes: Serialized SVG from _snapshot_svg()
+            output_path: Output PDF file path
+            raster_dpi: Resolution for rasterized content, or None to leave
+                Inkscape's default when the document has nothing to rasterize
+
+        Raises:
+            InkscapeExportError: If the stroke-to-path conversion or PDF export fails
+        """
+        # Convert strokes to paths before exporting
+        # This prevents PDF printers from applying transforms to strokes inconsistently
+        # The conversion bakes all transforms into path geometry; the actions run
+        # on the loaded document before the export options are applied
+        # Using high DPI (300 by default) for print-quality rasterized content
+        command = [
+            inkscape_path,
+            '--pipe',                    # Read the SVG from stdin
+            '--actions=select-all:all;object-stroke-to-path',
+            '--export-type=pdf',
+            f'--export-filename={output_path}',
+            '--export-text-to-path',
+        ]
+        if raster_dpi:
+            command.append(f'--export-dpi={raster_dpi}')  # Print quality resolution
+
+        try:
+            export_result = subprocess.run(command, input=svg_bytes, capture_output=True, timeout=60)
+        except subprocess.TimeoutExpired:
+            raise InkscapeExportError(
+                "Stroke-to-path conversion and PDF export timed out after 60 seconds"
+            )
+
+        # Check if conversion and export succeeded
+        if export_result.returncode != 0:
+            error_msg = (
+                export_result.stderr.decode(errors='replace')
+                or export_result.stdout.decode(errors='replace')
+                or "Unknown error"
+            )
+            raise InkscapeExportError(f"PDF export failed: {error_msg}")
 
     def _combine_side_by_side(self, left_pdf_path, right_pdf_path, output_path):
         """
@@ -837,7 +927,7 @@ class ExportPDFs(inkex.EffectExtension):
                 booklet_files.append(filename)
 
             except Exception as e:
-                inkex.errormsg(f"Failed to create booklet {filename}: {e}")
+                self._messages.append(f"Failed to create booklet {filename}: {e}")
 
         return booklet_files
 
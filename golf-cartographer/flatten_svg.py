@@ -19,6 +19,7 @@ from typing import TYPE_CHECKING, List, Tuple, Optional
 import inkex
 
 from color_utils import categorize_element_by_color
+from geometry_utils import get_canvas_bounds
 
 if TYPE_CHECKING:
     from inkex import BaseElement
@@ -151,9 +152,13 @@ class FlattenSVG(inkex.EffectExtension):
                 parent.remove(group)
 
         # Clean up any remaining empty groups at root level
-        for child in list(root):
-            if isinstance(child, inkex.Group) and len(child) == 0:
-                root.remove(child)
+        # (collect first so the root is not mutated while being iterated)
+        empty_groups = [
+            child for child in root
+            if isinstance(child, inkex.Group) and len(child) == 0
+        ]
+        for group in empty_groups:
+            root.remove(group)
 
     def _collect_elements(
         self,
@@ -189,30 +194,12 @@ class FlattenSVG(inkex.EffectExtension):
         """
         Get canvas boundaries from document viewBox or width/height attributes.
 
+        Delegates to the shared geometry utility.
+
         Returns:
             tuple: (x_min, y_min, x_max, y_max) canvas bounds in document units
         """
-        root = self.document.getroot()
-
-        # Try to get viewBox first (most reliable approach)
-        viewbox = root.get('viewBox')
-        if viewbox:
-            parts = viewbox.strip().split()
-            if len(parts) == 4:
-                x, y, w, h = map(float, parts)
-                return (x, y, x + w, y + h)
-
-        # Fall back to width/height attributes if viewBox not present
-        width = root.get('width')
-        height = root.get('height')
-        if width and height:
-            # Convert to user units (handles units like '100px', '10in', etc.)
-            w = self.svg.unittouu(width)
-            h = self.svg.unittouu(height)
-            return (0, 0, w, h)
-
-        # Default fallback (usually only reached for malformed SVG)
-        return (0, 0, 1000, 1000)
+        return get_canvas_bounds(self.document.getroot(), self.svg)
 
     def _filter_offcanvas_elements(
         self,
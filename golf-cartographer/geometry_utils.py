@@ -15,9 +15,10 @@ from __future__ import annotations
 
 import logging
 import math
-from typing import TYPE_CHECKING, List, Tuple, Optional
+from typing import TYPE_CHECKING, Dict, List, Tuple, Optional
 
 import inkex
+import numpy as np
 
 if TYPE_CHECKING:
     from inkex import BaseElement
@@ -32,6 +33,15 @@ Centroid = Tuple[float, float]  # (x, y)
 # Threshold for detecting degenerate polygons (~0.001mm² in typical user units)
 CENTROID_AREA_EPSILON: float = 0.0001
 
+# Target angles (radians) for each facing direction
+# In SVG coordinate system: +X is right, +Y is down
+DIRECTION_ANGLES: Dict[str, float] = {
+    'up': -math.pi / 2.0,    # -90 degrees (negative Y direction)
+    'down': math.pi / 2.0,    # 90 degrees (positive Y direction)
+    'left': math.pi,          # 180 degrees (negative X direction)
+    'right': 0.0,             # 0 degrees (positive X direction)
+}
+
 
 def calculate_centroid(elements: List[BaseElement]) -> Optional[Centroid]:
     """
@@ -67,16 +77,25 @@ def calculate_centroid(elements: List[BaseElement]) -> Optional[Centroid]:
         >>> # Use for positioning
         >>> yardage_lines.transform = Transform(translate=green_centroid)
     """
-    all_points: List[Tuple[float, float]] = []
+    point_arrays: List[np.ndarray] = []
 
     # Level 1: Try to extract vertices from path elements
     for element in elements:
         try:
             if isinstance(element, inkex.PathElement):
-                path = element.path.to_absolute()
-                for segment in path:
-                    if hasattr(segment, 'x') and hasattr(segment, 'y'):
-                        all_points.append((float(segment.x), float(segment.y)))
+                # Flatten endpoint coordinates straight into a float64 buffer
+                # instead of building a Python tuple per vertex
+                coords = np.fromiter(
+                    (
+                        coord
+                        for segment in element.path.to_absolute()
+                        if hasattr(segment, 'x') and hasattr(segment, 'y')
+                        for coord in (segment.x, segment.y)
+                    ),
+                    dtype=np.float64,
+                )
+                if coords.size:
+                    point_arrays.append(coords.reshape(-1, 2))
         except (AttributeError, TypeError, ValueError) as e:
             logger.debug(
                 "Could not extract path vertices for centroid from element %s: %s",
@@ -84,35 +103,29 @@ def calculate_centroid(elements: List[BaseElement]) -> Optional[Centroid]:
                 e,
             )
 
+    all_points = np.concatenate(point_arrays) if point_arrays else np.empty((0, 2))
+
     # If we have 3+ vertices, use shoelace formula
     if len(all_points) >= 3:
         try:
-            area = 0.0
-            cx = 0.0
-            cy = 0.0
+            x = all_points[:, 0]
+            y = all_points[:, 1]
 
             # Sum over all edges (closing the polygon)
-            for i in range(len(all_points)):
-                x1, y1 = all_points[i]
-                x2, y2 = all_points[(i + 1) % len(all_points)]
-                cross = x1 * y2 - x2 * y1
-                area += cross
-                cx += (x1 + x2) * cross
-                cy += (y1 + y2) * cross
-
-            area /= 2.0
+            x_next = np.roll(x, -1)
+            y_next = np.roll(y, -1)
+            cross = x * y_next - x_next * y
+            area = float(cross.sum()) / 2.0
 
             if abs(area) > CENTROID_AREA_EPSILON:
                 # Normal case: valid polygon area
-                cx = cx / (6.0 * area)
-                cy = cy / (6.0 * area)
+                cx = float(((x + x_next) * cross).sum()) / (6.0 * area)
+                cy = float(((y + y_next) * cross).sum()) / (6.0 * area)
                 return (cx, cy)
             else:
                 # Degenerate polygon: fall back to vertex average
                 logger.debug("Polygon area near zero, using vertex average for centroid")
-                cx = sum(p[0] for p in all_points) / len(all_points)
-                cy = sum(p[1] for p in all_points) / len(all_points)
-                return (cx, cy)
+                return (float(x.mean()), float(y.mean()))
         except (ZeroDivisionError, ArithmeticError) as e:
             logger.debug("Shoelace centroid calculation failed: %s", e)
 
@@ -173,20 +186,11 @@ def calculate_rotation_angle(
     # Calculate current angle from center to target
     angle_to_target = math.atan2(dy, dx)
 
-    # Define target angles for each direction
-    # In SVG coordinate system: +X is right, +Y is down
-    direction_angles = {
-        'up': -math.pi / 2.0,    # -90 degrees (negative Y direction)
-        'down': math.pi / 2.0,    # 90 degrees (positive Y direction)
-        'left': math.pi,          # 180 degrees (negative X direction)
-        'right': 0.0,             # 0 degrees (positive X direction)
-    }
-
-    if target_direction not in direction_angles:
+    target_angle = DIRECTION_ANGLES.get(target_direction)
+    if target_angle is None:
         logger.warning("Unknown direction '%s', defaulting to 'up'", target_direction)
-        target_direction = 'up'
+        target_angle = DIRECTION_ANGLES['up']
 
-    target_angle = direction_angles[target_direction]
     rotation_radians = target_angle - angle_to_target
     rotation_degrees = math.degrees(rotation_radians)
 
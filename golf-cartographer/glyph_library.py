@@ -21,9 +21,32 @@ Usage:
 """
 
 import os
+
+import inkex
 from inkex import Transform, Group, PathElement, load_svg
 
 
+# Clark-notation tag of the path elements that hold glyphs
+SVG_PATH_TAG = '{http://www.w3.org/2000/svg}path'
+
+# Parsed libraries kept for the life of the process: {library_path: (mtime, GlyphLibrary)}
+_LIBRARY_CACHE = {}
+
+# Glyph ID names for special characters (must match prepare_glyph_library.py)
+SPECIAL_GLYPH_NAMES = {
+    'colon': ':',
+    'period': '.',
+    'comma': ',',
+    'dash': '-',
+    'apostrophe': "'",
+    'quote': '"',
+    'lparen': '(',
+    'rparen': ')',
+    'slash': '/',
+    'space': ' ',
+}
+
+
 class GlyphLibrary:
     """Loads and manages a glyph library from an SVG file."""
 
@@ -36,13 +59,14 @@ class GlyphLibrary:
         """
         self.library_path = library_path
         self.glyphs = {}  # Cache: {char: path_element}
+        self._glyph_metrics = {}  # Cache: {char: (left, bottom, width, height)}
+        self._text_sizes = {}  # Cache: {(text, font_size, spacing): (width, height)}
+        self._glyph_attrs = {}  # Cache: {char: {'d': ..., 'style': ...}} copied onto new paths
         self._load_library()
 
     def _load_library(self):
         """Parse SVG file and extract all glyph path elements."""
-        # Get absolute path relative to this script's location
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        full_path = os.path.join(script_dir, self.library_path)
+        full_path = _library_full_path(self.library_path)
 
         if not os.path.exists(full_path):
             raise FileNotFoundError(f"Glyph library not found: {full_path}")
@@ -51,31 +75,18 @@ class GlyphLibrary:
         svg = load_svg(full_path)
         root = svg.getroot()
 
-        # Find all path elements with glyph IDs
-        for element in root.iter():
-            if isinstance(element, PathElement):
-                elem_id = element.get('id', '')
-                if elem_id.startswith('glyph-'):
-                    # Extract character from ID (e.g., "glyph-A" -> "A")
-                    char = elem_id.replace('glyph-', '', 1)
-
-                    # Handle special character names (must match prepare_glyph_library.py)
-                    special_names = {
-                        'colon': ':',
-                        'period': '.',
-                        'comma': ',',
-                        'dash': '-',
-                        'apostrophe': "'",
-                        'quote': '"',
-                        'lparen': '(',
-                        'rparen': ')',
-                        'slash': '/',
-                        'space': ' ',
-                    }
-                    char = special_names.get(char, char)
-
-                    # Store the path element
-                    self.glyphs[char] = element
+        # Find all path elements with glyph IDs (tag filtering happens inside lxml)
+        for element in root.iter(SVG_PATH_TAG):
+            elem_id = element.get('id', '')
+            if elem_id.startswith('glyph-'):
+                # Extract character from ID (e.g., "glyph-A" -> "A")
+                char = elem_id.replace('glyph-', '', 1)
+
+                # Handle special character names
+                char = SPECIAL_GLYPH_NAMES.get(char, char)
+
+                # Store the path element
+                self.glyphs[char] = element
 
     def get_glyph(self, char):
         """
@@ -89,6 +100,32 @@ class GlyphLibrary:
         """
         return self.glyphs.get(char)
 
+    def _glyph_bbox(self, char):
+        """
+        Get the bounding box edges of a glyph, computing them only once per character.
+
+        Library glyphs never change after loading, so the first bounding_box()
+        result is unpacked into plain floats and reused for every later
+        composition without further property lookups.
+
+        Args:
+            char: Single character to measure
+
+        Returns:
+            tuple: (left, bottom, width, height), or None if the character is
+                not in the library or its glyph has no bounding box
+        """
+        try:
+            return self._glyph_metrics[char]
+        except KeyError:
+            pass
+
+        glyph = self.get_glyph(char)
+        bbox = glyph.bounding_box() if glyph is not None else None
+        metrics = (bbox.left, bbox.bottom, bbox.width, bbox.height) if bbox is not None else None
+        self._glyph_metrics[char] = metrics
+        return metrics
+
     def compose_text(self, text, x, y, font_size=24, spacing=2):
         """
         Compose text by positioning glyph copies with bottom-left alignment.
@@ -118,6 +155,11 @@ class GlyphLibrary:
         group = Group()
         group.label = f"text-{text}"
 
+        # Blank text (empty or spaces only) produces no glyphs, so skip the
+        # per-character walk; spaces still contribute their nominal height
+        if not text.strip(' '):
+            return group, 0, (scale_factor * 6.3 if text else 0)
+
         current_x = x
         max_height = 0
         baseline_y = y
@@ -138,42 +180,39 @@ class GlyphLibrary:
             glyph = self.get_glyph(char)
             if glyph is None:
                 # Character not in library - warn and skip it
-                import inkex
                 inkex.utils.debug(f"WARNING: Character '{char}' not found in glyph library '{self.library_path}'")
                 continue
 
             # Get the glyph's bounding box (in library's coordinate system)
-            bbox = glyph.bounding_box()
-            if bbox is None or bbox.width == 0:
+            bbox = self._glyph_bbox(char)
+            if bbox is None or bbox[2] == 0:
                 # Skip empty/invalid glyphs
                 continue
+            bbox_left, bbox_bottom, bbox_width, bbox_height = bbox
 
             # Create NEW path element (don't clone across documents - that doesn't work!)
             new_path = PathElement()
 
-            # Copy the path data
-            new_path.set('d', glyph.get('d'))
-
-            # Copy style
-            if glyph.get('style'):
-                new_path.set('style', glyph.get('style'))
+            # Copy the path data and style in one attribute update
+            # The path data is cached pre-translated so the glyph's bottom-left
+            # corner sits at the origin; that constant library offset is then
+            # applied once per character instead of on every composition
+            glyph_attrs = self._glyph_attrs.get(char)
+            if glyph_attrs is None:
+                glyph_attrs = {'d': str(glyph.path.translate(-bbox_left, -bbox_bottom))}
+                if glyph.get('style'):
+                    glyph_attrs['style'] = glyph.get('style')
+                self._glyph_attrs[char] = glyph_attrs
+            new_path.attrib.update(glyph_attrs)
 
             # Calculate dimensions after scaling
-            glyph_height = bbox.height * scale_factor
-            glyph_width = bbox.width * scale_factor
-
-            # Calculate position with bottom-left alignment
-            # The bbox tells us where the glyph is positioned in the library
-            # We need to:
-            # 1. Cancel out the library position (bbox.left, bbox.bottom)
-            # 2. Move to our target position (current_x, baseline_y)
-            # 3. Account for scaling
-
-            final_x = current_x - (bbox.left * scale_factor)
-            final_y = baseline_y - (bbox.bottom * scale_factor)
+            glyph_height = bbox_height * scale_factor
+            glyph_width = bbox_width * scale_factor
 
-            # Apply transform: translate to position, then scale
-            new_path.transform = Transform(f"translate({final_x}, {final_y}) scale({scale_factor})")
+            # Position with bottom-left alignment: the normalized glyph only needs
+            # to be scaled and moved to our target position (current_x, baseline_y)
+            # (built directly as a matrix to avoid formatting and re-parsing a string)
+            new_path.transform = Transform(((scale_factor, 0, current_x), (0, scale_factor, baseline_y)))
 
             # Add to group
             group.add(new_path)
@@ -188,6 +227,72 @@ class GlyphLibrary:
 
         return group, total_width, total_height
 
+    def compose_many(self, texts, positions, font_size=24, spacing=2):
+        """
+        Compose several strings that share one font size and spacing.
+
+        Args:
+            texts: Sequence of strings to compose
+            positions: Sequence of (x, y) bottom-left positions, one per string
+            font_size: Target font size in POINTS (library is always 24pt)
+            spacing: Horizontal spacing between glyphs (in user units)
+
+        Returns:
+            list: (group_element, total_width, total_height) for each string,
+                in the same order as texts
+        """
+        compose = self.compose_text
+        return [
+            compose(text, x, y, font_size, spacing)
+            for text, (x, y) in zip(texts, positions)
+        ]
+
+    def measure_text(self, text, font_size=24, spacing=2):
+        """
+        Measure text without building any glyph elements.
+
+        Uses the same layout rules as compose_text(), so the returned size
+        always matches what compose_text() would report for the same input.
+        Results are cached per (text, font_size, spacing).
+
+        Args:
+            text: String to measure
+            font_size: Target font size in POINTS (library is always 24pt)
+            spacing: Horizontal spacing between glyphs (in user units)
+
+        Returns:
+            tuple: (total_width, total_height) in user units
+        """
+        key = (text, font_size, spacing)
+        cached = self._text_sizes.get(key)
+        if cached is not None:
+            return cached
+
+        scale_factor = font_size / 24.0
+
+        advance = 0
+        max_height = 0
+        glyph_count = 0
+
+        for char in text:
+            if char == ' ':
+                advance += scale_factor * 1.6
+                max_height = max(max_height, scale_factor * 6.3)
+                continue
+
+            bbox = self._glyph_bbox(char)
+            if bbox is None or bbox[2] == 0:
+                continue
+            _, _, bbox_width, bbox_height = bbox
+
+            advance += bbox_width * scale_factor + spacing
+            max_height = max(max_height, bbox_height * scale_factor)
+            glyph_count += 1
+
+        total_width = advance - spacing if glyph_count > 0 else 0
+        self._text_sizes[key] = (total_width, max_height)
+        return total_width, max_height
+
     def get_available_chars(self):
         """
         Get list of available characters in this library.
@@ -198,6 +303,42 @@ class GlyphLibrary:
         return sorted(self.glyphs.keys())
 
 
+def _library_full_path(library_path):
+    """Resolve a library path relative to this script's location."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, library_path)
+
+
+def load_glyph_library(library_path):
+    """
+    Load a glyph library, reusing an already-parsed instance for the same path.
+
+    Parsing the library SVG is the most expensive step of text composition,
+    so repeated loads in one Python process share a single GlyphLibrary.
+    The cached instance is keyed on the file's modification time, so a
+    library regenerated on disk is picked up on the next load.
+    Returned libraries must be treated as read-only.
+
+    Args:
+        library_path: Path to glyph library SVG file
+
+    Returns:
+        GlyphLibrary: Loaded (possibly cached) library
+    """
+    try:
+        mtime = os.path.getmtime(_library_full_path(library_path))
+    except OSError:
+        mtime = None
+
+    cached = _LIBRARY_CACHE.get(library_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    library = GlyphLibrary(library_path)
+    _LIBRARY_CACHE[library_path] = (mtime, library)
+    return library
+
+
 # Convenience function for quick text composition
 def compose_text(library_path, text, x, y, font_size=24, spacing=2):
     """
@@ -213,5 +354,5 @@ def compose_text(library_path, text, x, y, font_size=24, spacing=2):
     Returns:
         tuple: (group_element, total_width, total_height)
     """
-    library = GlyphLibrary(library_path)
+    library = load_glyph_library(library_path)
     return library.compose_text(text, x, y, font_size, spacing)
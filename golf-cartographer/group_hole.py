@@ -20,16 +20,21 @@ License: MIT
 from __future__ import annotations
 
 import argparse
+import array
 import logging
+import zlib
 from typing import TYPE_CHECKING, List, Tuple, Optional
 
 import inkex
-from inkex import Group, PathElement, Transform, Defs, ClipPath, Rectangle
+import numpy as np
+from lxml import etree
 
 from color_utils import categorize_element_by_color
+from geometry_utils import get_canvas_bounds
 
 if TYPE_CHECKING:
     from inkex import BaseElement
+    from inkex.transforms import BoundingBox
 
 # Configure module logger
 logger = logging.getLogger(__name__)
@@ -38,6 +43,48 @@ logger = logging.getLogger(__name__)
 CanvasBounds = Tuple[float, float, float, float]  # (x_min, y_min, x_max, y_max)
 Centroid = Tuple[float, float]  # (x, y)
 
+# Vertices closer than this to their predecessor are treated as duplicates
+VERTEX_DEDUP_EPSILON = 1e-6
+
+# Attributes used to store a green's computed centroid on the green itself
+CENTROID_X_ATTR = 'data-centroid-x'
+CENTROID_Y_ATTR = 'data-centroid-y'
+CENTROID_SIGNATURE_ATTR = 'data-centroid-hash'
+
+# Compiled XPath queries reused across hole runs; they search descendants, matching
+# where Stage 1 (flatten_svg) puts canvas-clip: the first defs anywhere in the document
+SVG_NS = {'svg': 'http://www.w3.org/2000/svg'}
+_DEFS_XPATH = etree.XPath('.//svg:defs', namespaces=SVG_NS)
+_CANVAS_CLIP_XPATH = etree.XPath('.//svg:clipPath[@id="canvas-clip"]', namespaces=SVG_NS)
+
+# Clark-notation key for inkscape:label, read directly in label-scanning loops
+_LABEL_KEY = '{http://www.inkscape.org/namespaces/inkscape}label'
+
+
+def _shoelace(xs: np.ndarray, ys: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Shoelace kernel over closed polygon coordinate arrays.
+
+    Args:
+        xs: Vertex x coordinates (float64)
+        ys: Vertex y coordinates (float64)
+
+    Returns:
+        tuple: (2 * signed area, Σ(x_i + x_i+1) * cross_i, Σ(y_i + y_i+1) * cross_i)
+    """
+    xs_next = np.roll(xs, -1)
+    ys_next = np.roll(ys, -1)
+
+    # Cross product per edge (signed area of triangle with origin)
+    cross = xs * ys_next - xs_next * ys
+
+    # Dot products fold the multiply and the sum into one pass per component
+    return (
+        float(cross.sum()),
+        float(np.dot(xs + xs_next, cross)),
+        float(np.dot(ys + ys_next, cross)),
+    )
+
 
 class GroupHole(inkex.EffectExtension):
     """
@@ -94,52 +141,54 @@ class GroupHole(inkex.EffectExtension):
         This approach allows the yardage line template to be positioned anywhere in the
         source SVG and still end up correctly positioned at the green center.
         """
-        if not self.svg.selected:
+        # Snapshot the selection once; elements are moved out of their parents below
+        selected_elements = tuple(self.svg.selected.values())
+        if not selected_elements:
             inkex.errormsg("Please select elements for the hole")
             return
 
         root = self.document.getroot()
         hole_num = self.options.hole_number
 
+        # Bounding boxes computed during this run, keyed by element identity
+        self._bbox_cache = {}
+
         # Create main hole group
-        hole_group = Group()
+        hole_group = inkex.Group()
         hole_group.label = f"hole_{hole_num:02d}"
 
         # Create subgroups
-        fairways_group = Group()
+        fairways_group = inkex.Group()
         fairways_group.label = "fairways"
 
-        bunkers_group = Group()
+        bunkers_group = inkex.Group()
         bunkers_group.label = "bunkers"
 
-        other_group = Group()
+        other_group = inkex.Group()
         other_group.label = "other"
 
-        # Categorize selected elements using shared color utilities
+        # Categorize selected elements using shared color utilities and move them
+        # straight into their subgroups (bunkers stay flat, no subgroups).
+        # Greens are collected separately because their IDs are assigned later.
         green_elements = []
-        fairway_elements = []
-        bunker_elements = []
-        other_elements = []
 
-        for element in self.svg.selected.values():
+        for element in selected_elements:
             category = categorize_element_by_color(element)
 
             if category == "green":
                 green_elements.append(element)
             elif category == "fairway":
-                fairway_elements.append(element)
+                fairways_group.append(element)
             elif category == "bunker":
-                bunker_elements.append(element)
+                bunkers_group.append(element)
             else:
-                other_elements.append(element)
-
-        # Populate fairways group
-        for element in fairway_elements:
-            fairways_group.append(element)
+                # Uncategorized elements go to the other group
+                other_group.append(element)
 
-        # Populate bunkers group (flat, no subgroups)
-        for element in bunker_elements:
-            bunkers_group.append(element)
+        # Index groups by label once so template/'other' lookups don't rescan the tree
+        # (built only now, after the selection has moved into the detached subgroups,
+        # so selected groups can't be picked up as the template)
+        self._index_groups(root)
 
         # Handle yardage lines (template duplication and positioning)
         yardage_clone = None  # Will be set if yardage template is found
@@ -161,11 +210,9 @@ class GroupHole(inkex.EffectExtension):
                 centroid = self._calculate_centroid(green_elements)
 
                 # Get current position of yardage template
-                template_bbox = yardage_clone.bounding_box()
-                if template_bbox is not None:
-                    # Calculate center of yardage template's bounding box
-                    template_center_x = (template_bbox.left + template_bbox.right) / 2
-                    template_center_y = (template_bbox.top + template_bbox.bottom) / 2
+                template_center = self._get_template_center(yardage_clone)
+                if template_center is not None:
+                    template_center_x, template_center_y = template_center
 
                     # Calculate offset needed to move template center to green centroid
                     # This calculation allows the template to be positioned anywhere
@@ -174,34 +221,35 @@ class GroupHole(inkex.EffectExtension):
                     offset_y = centroid[1] - template_center_y
 
                     # Apply translation transform to move template
-                    # The composition order (translate @ transform) ensures the template
+                    # Pre-translating (translate @ transform) ensures the template
                     # moves to the target position regardless of existing transforms
-                    yardage_clone.transform = Transform(translate=(offset_x, offset_y)) @ yardage_clone.transform
+                    yardage_clone.transform = self._pretranslate(yardage_clone.transform, offset_x, offset_y)
                 else:
                     # Fallback: if bounding box fails, translate directly to centroid
                     # (assumes template was originally at 0,0)
-                    yardage_clone.transform = Transform(translate=centroid) @ yardage_clone.transform
+                    yardage_clone.transform = self._pretranslate(yardage_clone.transform, *centroid)
 
             # Yardage lines will be added to hole_group above green elements (not to other_group)
             # This is done later after green elements are added
 
-        # Add uncategorized elements to other group
-        for element in other_elements:
-            other_group.append(element)
-
         # Copy contents from root-level 'other' group (if it exists)
         # This includes water, trees, and paths from Stage 1
         # NOTE: Explicitly excludes 'mapping_lines' subgroup as these are layout guides
         # that should not be duplicated per hole
         root_other_group = self._find_root_other_group()
         if root_other_group is not None:
-            # Clone children from the root 'other' group, excluding 'mapping_lines'
+            # Locate the 'mapping_lines' subgroup (case-insensitive) once, then
+            # clone every other child without re-reading labels
+            mapping_lines_group = next(
+                (
+                    child for child in root_other_group
+                    if isinstance(child, inkex.Group) and (child.get(_LABEL_KEY) or '').lower() == 'mapping_lines'
+                ),
+                None,
+            )
             for child in root_other_group:
-                # Skip 'mapping_lines' subgroup (case-insensitive)
-                if isinstance(child, Group):
-                    child_label = child.label
-                    if child_label and child_label.lower() == 'mapping_lines':
-                        continue  # Skip this child
+                if child is mapping_lines_group:
+                    continue  # Skip this child
 
                 # Copy all other children
                 child_clone = child.copy()
@@ -221,19 +269,19 @@ class GroupHole(inkex.EffectExtension):
             hole_group.append(fairways_group)
 
         # Green elements go directly at top level of hole group (not in subgroup)
-        # This allows Stage 3 (Auto-Place Holes) to easily locate them via XPath queries
+        # This allows Stage 3 (Auto-Place Holes) to easily locate them via XPath queries.
+        # Move them first (one extend detaches them from their old parents) so the
+        # new IDs are assigned while the hole group is still off the document tree.
+        hole_group.extend(green_elements)
         for i, element in enumerate(green_elements):
-            # Assign ID based on hole number for later identification
-            # Standard format: green_XX (e.g., green_01, green_02, etc.)
-            element.set('id', f"green_{hole_num:02d}")
-
-            # If multiple green elements exist for this hole (rare but possible),
-            # append an index to distinguish them (e.g., green_01_01, green_01_02)
             if len(green_elements) > 1:
+                # If multiple green elements exist for this hole (rare but possible),
+                # append an index to distinguish them (e.g., green_01_01, green_01_02)
                 element.set('id', f"green_{hole_num:02d}_{i+1:02d}")
-
-            # Append green element directly to hole group (top layer)
-            hole_group.append(element)
+            else:
+                # Assign ID based on hole number for later identification
+                # Standard format: green_XX (e.g., green_01, green_02, etc.)
+                element.set('id', f"green_{hole_num:02d}")
 
         # Add yardage lines above green elements (top-most layer)
         # This ensures yardage lines render on top of all other hole elements
@@ -252,38 +300,13 @@ class GroupHole(inkex.EffectExtension):
         """
         Get canvas boundaries from document viewBox or width/height attributes.
 
-        Canvas bounds are determined in the following order of preference:
-        1. viewBox attribute (most reliable for coordinate system)
-        2. width/height attributes (fallback if viewBox not present)
-        3. Default 1000x1000 (last resort)
-
-        The viewBox approach is preferred because it directly defines the coordinate
-        system for the entire document, whereas width/height may be in different units.
+        Delegates to the shared geometry utility, so Stage 1 and Stage 2 parse
+        the canvas the same way.
 
         Returns:
             tuple: (x_min, y_min, x_max, y_max) canvas bounds in document units
         """
-        root = self.document.getroot()
-
-        # Try to get viewBox first (most reliable approach)
-        viewbox = root.get('viewBox')
-        if viewbox:
-            parts = viewbox.strip().split()
-            if len(parts) == 4:
-                x, y, w, h = map(float, parts)
-                return (x, y, x + w, y + h)
-
-        # Fall back to width/height attributes if viewBox not present
-        width = root.get('width')
-        height = root.get('height')
-        if width and height:
-            # Convert to user units (handles units like '100px', '10in', etc.)
-            w = self.svg.unittouu(width)
-            h = self.svg.unittouu(height)
-            return (0, 0, w, h)
-
-        # Default fallback (usually only reached for malformed SVG)
-        return (0, 0, 1000, 1000)
+        return get_canvas_bounds(self.document.getroot(), self.svg)
 
     def _ensure_canvas_clip(
         self,
@@ -311,32 +334,62 @@ class GroupHole(inkex.EffectExtension):
         x_min, y_min, x_max, y_max = canvas_bounds
 
         # Get or create defs section (where clipPath elements belong)
-        defs = root.find('.//{http://www.w3.org/2000/svg}defs')
-        if defs is None:
-            defs = Defs()
+        defs_matches = _DEFS_XPATH(root)
+        if defs_matches:
+            defs = defs_matches[0]
+        else:
+            defs = inkex.Defs()
             root.insert(0, defs)
 
         # Check if canvas-clip already exists (from Stage 1 or previous holes)
-        existing_clip = root.find('.//{http://www.w3.org/2000/svg}clipPath[@id="canvas-clip"]')
-        if existing_clip is not None:
+        if _CANVAS_CLIP_XPATH(root):
             # Clip path already exists, reuse it
             return
 
         # Create new clip path element
-        clip_path = ClipPath()
-        clip_path.set('id', 'canvas-clip')
+        clip_path = inkex.ClipPath(id='canvas-clip')
 
-        # Create rectangle that matches canvas bounds (clipping region)
-        rect = Rectangle()
-        rect.set('x', str(x_min))
-        rect.set('y', str(y_min))
-        rect.set('width', str(x_max - x_min))
-        rect.set('height', str(y_max - y_min))
+        # Create rectangle that matches canvas bounds (clipping region),
+        # passing all attributes to the constructor in one go
+        rect = inkex.Rectangle(
+            x=str(x_min),
+            y=str(y_min),
+            width=str(x_max - x_min),
+            height=str(y_max - y_min),
+        )
 
         clip_path.append(rect)
         defs.append(clip_path)
 
-    def _find_yardage_template(self) -> Optional[Group]:
+    def _index_groups(self, root: inkex.SvgDocumentElement) -> None:
+        """
+        Build label lookups for all groups in a single pass over the document.
+
+        Labels are lowercased; when several groups share a label, the first one
+        in document order is kept, matching the previous linear searches.
+
+        Args:
+            root: SVG root element
+
+        Side Effects:
+            - Sets self._groups_by_label (every group in the document)
+            - Sets self._root_groups_by_label (direct children of root only)
+        """
+        self._groups_by_label = {}
+        for element in root.iter():
+            if isinstance(element, inkex.Group):
+                label = element.get(_LABEL_KEY)
+                if label:
+                    self._groups_by_label.setdefault(label.lower(), element)
+
+        self._root_groups_by_label = {}
+        for child in root:
+            if isinstance(child, inkex.Group):
+                label = child.get(_LABEL_KEY)
+                if label:
+                    self._root_groups_by_label.setdefault(label.lower(), child)
+
+    def _find_yardage_template(self) -> Optional[inkex.Group]:
         """
         Find yardage line template group.
 
@@ -349,19 +402,16 @@ class GroupHole(inkex.EffectExtension):
             if element is not None:
                 return element
 
-        # Try to find by label
-        root = self.document.getroot()
-        for element in root.iter():
-            if isinstance(element, Group):
-                label = element.label
-                if label and 'yardage' in label.lower():
-                    return element
+        # Try to find by label (first group in document order wins)
+        for label, element in self._groups_by_label.items():
+            if 'yardage' in label:
+                return element
 
         # No yardage template found
         inkex.errormsg("Yardage line template not found. Continuing without yardage lines.")
         return None
 
-    def _find_root_other_group(self) -> Optional[Group]:
+    def _find_root_other_group(self) -> Optional[inkex.Group]:
         """
         Find the root-level 'other' group created by Stage 1 (Flatten SVG Tool).
 
@@ -374,20 +424,139 @@ class GroupHole(inkex.EffectExtension):
         Returns:
             Group or None: Root-level 'other' group if found
         """
-        root = self.document.getroot()
-
         # Search direct children of root for a group labeled 'other'
-        for child in root:
-            if isinstance(child, Group):
-                label = child.label
-                if label and label.lower() == 'other':
-                    return child
+        # (re-check the parent in case the group was part of the selection and moved)
+        other_group = self._root_groups_by_label.get('other')
+        if other_group is not None and other_group.getparent() is self.document.getroot():
+            return other_group
 
         # No root-level 'other' group found - this is okay if Stage 1 wasn't run
         # or if there were no 'other' elements to categorize
         return None
 
+    def _get_template_center(self, yardage_clone: inkex.Group) -> Optional[Centroid]:
+        """
+        Get the center of the yardage template's bounding box.
+
+        Measured fresh on every run (through the per-run bounding box cache),
+        so edits to the yardage lines or transforms are always picked up.
+
+        Args:
+            yardage_clone: Untransformed copy of the template being positioned
+
+        Returns:
+            tuple or None: (x, y) template center, or None if it cannot be measured
+        """
+        template_bbox = self._cached_bounding_box(yardage_clone)
+        if template_bbox is None:
+            return None
+
+        center_x = (template_bbox.left + template_bbox.right) / 2
+        center_y = (template_bbox.top + template_bbox.bottom) / 2
+        return (center_x, center_y)
+
+    def _cached_bounding_box(self, element: BaseElement) -> Optional[BoundingBox]:
+        """
+        Get an element's bounding box, computing it at most once per effect run.
+
+        inkex computes bounding boxes by walking every path segment, which is
+        expensive for detailed greens and yardage templates.
+
+        Args:
+            element: SVG element to measure
+
+        Returns:
+            BoundingBox or None: Cached result of element.bounding_box()
+        """
+        key = id(element)
+        if key in self._bbox_cache:
+            return self._bbox_cache[key]
+        bbox = element.bounding_box()
+        self._bbox_cache[key] = bbox
+        return bbox
+
+    @staticmethod
+    def _pretranslate(transform: inkex.Transform, dx: float, dy: float) -> inkex.Transform:
+        """
+        Compose a translation in front of an existing transform.
+
+        Equivalent to Transform(translate=(dx, dy)) @ transform: a leading pure
+        translation only shifts the e/f components, so no matrix product is needed.
+
+        Args:
+            transform: Existing element transform
+            dx: Horizontal translation in user units
+            dy: Vertical translation in user units
+
+        Returns:
+            Transform: New transform with the translation applied last
+        """
+        (a, c, e), (b, d, f) = transform.matrix
+        return inkex.Transform(((a, c, e + dx), (b, d, f + dy)))
+
     def _calculate_centroid(self, elements: List[BaseElement]) -> Centroid:
+        """
+        Calculate the green centroid, reusing a centroid stored on a single green.
+
+        A single green path remembers its centroid in data-centroid-x/y together
+        with a signature of its 'd' attribute, so re-running the tool on an
+        unchanged green skips the polygon walk. Editing the path changes the
+        signature and forces a fresh calculation.
+
+        Args:
+            elements: List of SVG elements (expected to be green shapes)
+
+        Returns:
+            tuple: (x, y) coordinates of the geometric centroid
+        """
+        # A lone non-path green (circle, rect, ...) has no vertices to walk:
+        # go straight to its bounding box center
+        if len(elements) == 1 and not isinstance(elements[0], inkex.PathElement):
+            try:
+                bbox = self._cached_bounding_box(elements[0])
+                if bbox is not None:
+                    return ((bbox.left + bbox.right) / 2.0, (bbox.top + bbox.bottom) / 2.0)
+            except (AttributeError, TypeError, ValueError) as e:
+                logger.debug("Could not calculate bounding box for single green: %s", e)
+
+        cacheable = len(elements) == 1 and isinstance(elements[0], inkex.PathElement)
+        if cacheable:
+            element = elements[0]
+            signature = self._centroid_signature(element)
+            cached_x = element.get(CENTROID_X_ATTR)
+            cached_y = element.get(CENTROID_Y_ATTR)
+            if (cached_x is not None and cached_y is not None
+                    and element.get(CENTROID_SIGNATURE_ATTR) == signature):
+                try:
+                    return (float(cached_x), float(cached_y))
+                except ValueError as e:
+                    logger.debug("Ignoring invalid cached centroid: %s", e)
+
+        centroid = self._compute_centroid(elements)
+
+        if cacheable:
+            # repr() round-trips exactly, so cached and fresh runs place lines identically
+            element.set(CENTROID_X_ATTR, repr(centroid[0]))
+            element.set(CENTROID_Y_ATTR, repr(centroid[1]))
+            element.set(CENTROID_SIGNATURE_ATTR, signature)
+
+        return centroid
+
+    @staticmethod
+    def _centroid_signature(element: BaseElement) -> str:
+        """
+        Build a cheap, process-independent signature of a path's 'd' attribute.
+
+        Args:
+            element: Path element
+
+        Returns:
+            str: CRC32 and length of the path data
+        """
+        path_data = element.get('d') or ''
+        return f"{zlib.crc32(path_data.encode('utf-8')):08x}-{len(path_data)}"
+
+    def _compute_centroid(self, elements: List[BaseElement]) -> Centroid:
         """
         Calculate true geometric centroid using polygon shoelace formula.
 
@@ -414,10 +583,11 @@ class GroupHole(inkex.EffectExtension):
         the triangle formed by the origin and the edge from vertex i to i+1.
 
         Algorithm Implementation:
-        1. Extract all path vertices from green elements
-        2. Iterate through consecutive vertex pairs (closing the polygon)
-        3. Calculate cross product for each edge
-        4. Accumulate area and centroid components
+        1. Extract all path vertices from green elements and translate them so the
+           first vertex sits at the origin (the centroid is shifted back at the end)
+        2. Pair each vertex with the next one (np.roll closes the polygon)
+        3. Calculate cross product for each edge as one array operation
+        4. Sum area and centroid components over the edge arrays
         5. Divide by accumulated area to get final centroid
 
         Level 2: Simple Vertex Average - For degenerate polygons
@@ -445,22 +615,29 @@ class GroupHole(inkex.EffectExtension):
         - Simple average: Reasonable for small deviations or vertex clouds
         - Bounding box: Acceptable for regular shapes but may be off-center for kidney beans
         """
-        all_points = []
+        # Vertex coordinates accumulate in flat float64 buffers (no per-vertex tuples)
+        xs = array.array('d')
+        ys = array.array('d')
 
         # Level 1: Try to extract vertices from path elements
+        append_x = xs.append
+        append_y = ys.append
         for element in elements:
+            start = len(xs)
             try:
                 if isinstance(element, inkex.PathElement):
-                    path = element.path.to_absolute()
-
-                    # Extract vertices from path - collect all endpoint coordinates
-                    for segment in path:
-                        # Different segment types store endpoints differently
-                        if hasattr(segment, 'x') and hasattr(segment, 'y'):
-                            # Direct x,y attributes (most common)
-                            all_points.append((float(segment.x), float(segment.y)))
+                    # Extract vertices from path - end_points yields the absolute
+                    # endpoint of every segment (lines, curves, arcs, closes) while
+                    # tracking the pen itself, so no to_absolute() copy is needed.
+                    # Coordinates stream straight into the shared buffers.
+                    for point in element.path.end_points:
+                        append_x(point.x)
+                        append_y(point.y)
             except (AttributeError, TypeError, ValueError) as e:
-                # Skip elements that can't be parsed (non-path or corrupted)
+                # Skip elements that can't be parsed (non-path or corrupted),
+                # discarding any points already streamed from them
+                del xs[start:]
+                del ys[start:]
                 logger.debug(
                     "Could not extract path vertices from element %s: %s",
                     element.get('id', 'unknown'),
@@ -468,38 +645,46 @@ class GroupHole(inkex.EffectExtension):
                 )
 
         # If we successfully extracted 3+ vertices, use shoelace formula
-        if len(all_points) >= 3:
+        if len(xs) >= 3:
             try:
-                # Shoelace formula for polygon centroid
-                area = 0.0
-                cx = 0.0
-                cy = 0.0
-
-                # Sum over all edges (closing the polygon by wrapping around)
-                for i in range(len(all_points)):
-                    x1, y1 = all_points[i]
-                    x2, y2 = all_points[(i + 1) % len(all_points)]
-
-                    # Calculate cross product (signed area of triangle with origin)
-                    cross = x1 * y2 - x2 * y1
-                    area += cross
-                    cx += (x1 + x2) * cross
-                    cy += (y1 + y2) * cross
+                # Shoelace formula for polygon centroid, evaluated over whole
+                # vertex arrays (zero-copy views of the coordinate buffers)
+                x = np.frombuffer(xs, dtype=np.float64)
+                y = np.frombuffer(ys, dtype=np.float64)
+
+                # Drop vertices that repeat their predecessor (subpath closes,
+                # stacked bezier endpoints); zero-length edges add nothing to
+                # the shoelace sums but still cost work and skew the average
+                keep = (
+                    (np.abs(np.diff(x, prepend=x[-1])) > VERTEX_DEDUP_EPSILON)
+                    | (np.abs(np.diff(y, prepend=y[-1])) > VERTEX_DEDUP_EPSILON)
+                )
+                if not keep.any():
+                    keep[0] = True
+
+                # Work relative to the first vertex: document coordinates sit
+                # far from the origin, and the cross products of large, nearly
+                # equal terms would otherwise lose precision
+                x = x[keep]
+                y = y[keep]
+                origin_x = float(x[0])
+                origin_y = float(y[0])
+                x -= origin_x
+                y -= origin_y
+                twice_area, cx_sum, cy_sum = _shoelace(x, y)
 
                 # Divide area by 2 to get actual area
-                area /= 2.0
+                area = twice_area / 2.0
 
                 # Avoid division by zero for degenerate polygons
                 if abs(area) > 0.0001:
-                    cx = cx / (6.0 * area)
-                    cy = cy / (6.0 * area)
-                    return (cx, cy)
+                    cx = cx_sum / (6.0 * area)
+                    cy = cy_sum / (6.0 * area)
+                    return (cx + origin_x, cy + origin_y)
                 else:
                     # Area is too small - polygon is degenerate (line or point)
                     # Fall back to simple arithmetic mean of vertices
-                    cx = sum(p[0] for p in all_points) / len(all_points)
-                    cy = sum(p[1] for p in all_points) / len(all_points)
-                    return (cx, cy)
+                    return (float(x.mean()) + origin_x, float(y.mean()) + origin_y)
             except (ZeroDivisionError, ArithmeticError) as e:
                 # Shoelace calculation failed - continue to fallback
                 logger.debug("Shoelace centroid calculation failed: %s", e)
@@ -512,7 +697,7 @@ class GroupHole(inkex.EffectExtension):
 
         for element in elements:
             try:
-                bbox = element.bounding_box()
+                bbox = self._cached_bounding_box(element)
                 if bbox is not None:
                     # Calculate bounding box center
                     center_x = (bbox.left + bbox.right) / 2.0
@@ -14,11 +14,73 @@ Removes all existing layers to ensure a clean document.
 Part of Golf Cartographer extension suite.
 """
 
+import functools
+import re
 import inkex
 from inkex import TextElement, Group
 import subprocess
-import os
-from pathlib import Path
+
+# Clark-notation names used to find layers without an XPath query
+SVG_GROUP_TAG = '{http://www.w3.org/2000/svg}g'
+INKSCAPE_GROUPMODE_ATTR = '{http://www.inkscape.org/namespaces/inkscape}groupmode'
+
+# Common style suffixes stripped from font file names in the fallback scan
+_STYLE_SUFFIX_RE = re.compile(r'-?(?:Regular|Bold|Italic|BoldItalic)$')
+
+# Footer printed after the font listing
+FONT_LIST_NOTES = "\n".join([
+    "=" * 60,
+    "NOTES:",
+    "- Font names are case-sensitive",
+    "- Use these exact names in the Font Family field",
+    "- Select style (Regular/Bold/Italic) using Font Style dropdown",
+    "=" * 60,
+])
+
+# Descriptive glyph ID names for special characters (must match glyph_library.py)
+SPECIAL_CHAR_NAMES = {
+    ':': 'colon',
+    '.': 'period',
+    ',': 'comma',
+    '-': 'dash',
+    "'": 'apostrophe',
+    '"': 'quote',
+    '(': 'lparen',
+    ')': 'rparen',
+    '/': 'slash',
+    ' ': 'space',
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _list_fontconfig_families():
+    """
+    List font families known to fontconfig, running fc-list at most once per process.
+
+    Returns:
+        frozenset: Unique font family names, or None if fc-list is unavailable or fails
+    """
+    try:
+        result = subprocess.run(
+            ['fc-list', ':', 'family'],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    # Parse fc-list output
+    # Format: "Font Family,Alternative Name:style=Regular"
+    # Family name is the text before the first colon or comma
+    families = frozenset(
+        line.partition(':')[0].partition(',')[0].strip()
+        for line in result.stdout.splitlines()
+    )
+    return families - {''}
 
 
 class PrepareGlyphLibrary(inkex.EffectExtension):
@@ -59,9 +121,10 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         font_size_pt = 24
 
         # Convert mm and pt to user units
-        start_x = self.svg.unittouu(f"{start_x_mm}mm")
-        start_y = self.svg.unittouu(f"{start_y_mm}mm")
-        spacing = self.svg.unittouu(f"{spacing_mm}mm")
+        start_x = self.mm_to_uu(start_x_mm)
+        start_y = self.mm_to_uu(start_y_mm)
+        spacing = self.mm_to_uu(spacing_mm)
+        row_spacing = self.mm_to_uu(row_spacing_mm)
         font_size_uu = self.svg.unittouu(f"{font_size_pt}pt")
 
         # Create groups for each character set
@@ -77,7 +140,7 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         )
 
         # Position capitals below digits
-        capitals_start_y = start_y + self.svg.unittouu(f"{row_spacing_mm}mm")
+        capitals_start_y = start_y + row_spacing
         capitals_group = self.create_character_group(
             capitals,
             font_family,
@@ -90,7 +153,7 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         )
 
         # Position lowercases below capitals
-        lowercases_start_y = capitals_start_y + self.svg.unittouu(f"{row_spacing_mm}mm")
+        lowercases_start_y = capitals_start_y + row_spacing
         lowercases_group = self.create_character_group(
             lowercases,
             font_family,
@@ -103,7 +166,7 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         )
 
         # Position symbols below lowercases
-        symbols_start_y = lowercases_start_y + self.svg.unittouu(f"{row_spacing_mm}mm")
+        symbols_start_y = lowercases_start_y + row_spacing
         symbols_group = self.create_character_group(
             symbols,
             font_family,
@@ -124,8 +187,11 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         # Remove any existing layers from the document
         self.remove_all_layers()
 
-        # Resize canvas to fit content with padding
-        self.resize_canvas_to_content(padding_mm=5)
+        # Resize canvas to fit the glyph groups with padding
+        self.resize_canvas_to_content(
+            [digits_group, capitals_group, lowercases_group, symbols_group],
+            padding_mm=5
+        )
 
     def validate_font_family(self, font_family):
         """
@@ -180,20 +246,7 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         Returns:
             String name for use in glyph ID (e.g., 'colon', 'A', '5')
         """
-        # Map special characters to descriptive names
-        special_chars = {
-            ':': 'colon',
-            '.': 'period',
-            ',': 'comma',
-            '-': 'dash',
-            "'": 'apostrophe',
-            '"': 'quote',
-            '(': 'lparen',
-            ')': 'rparen',
-            '/': 'slash',
-            ' ': 'space',
-        }
-        return special_chars.get(char, char)
+        return SPECIAL_CHAR_NAMES.get(char, char)
 
     def create_character_group(self, characters, font_family, font_style, font_size_uu,
                                 start_x, start_y, spacing, group_name):
@@ -220,6 +273,24 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         current_x = start_x
         text_elements = []  # Collect elements to reverse order
 
+        # Build font style once - none of it depends on the character
+        font_weight = 'bold' if 'bold' in font_style else 'normal'
+        font_style_prop = 'italic' if 'italic' in font_style else 'normal'
+
+        # Text styling shared by every character (font-size in user units, no unit suffix),
+        # serialized to its CSS string once rather than per text element
+        text_style = str(inkex.Style({
+            'font-family': font_family,
+            'font-size': f'{font_size_uu}px',
+            'font-weight': font_weight,
+            'font-style': font_style_prop,
+            'fill': '#000000',
+            'text-anchor': 'start',
+        }))
+
+        # All characters share the same baseline
+        y_str = str(start_y)
+
         for char in characters:
             # Create text element
             text_elem = TextElement()
@@ -227,21 +298,10 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
 
             # Set position
             text_elem.set('x', str(current_x))
-            text_elem.set('y', str(start_y))
-
-            # Build font style string
-            font_weight = 'bold' if 'bold' in font_style else 'normal'
-            font_style_prop = 'italic' if 'italic' in font_style else 'normal'
-
-            # Set text styling (font-size in user units, no unit suffix)
-            text_elem.style = {
-                'font-family': font_family,
-                'font-size': f'{font_size_uu}px',
-                'font-weight': font_weight,
-                'font-style': font_style_prop,
-                'fill': '#000000',
-                'text-anchor': 'start',
-            }
+            text_elem.set('y', y_str)
+
+            # Set text styling
+            text_elem.set('style', text_style)
 
             # Set unique ID using glyph naming convention
             # Special characters use descriptive names (glyph-colon, glyph-period, etc.)
@@ -259,11 +319,29 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         # Add elements in reverse order to group (for proper stacking)
         # Visual order: left-to-right (0-9, A-Z, a-z)
         # DOM order: reversed (9-0, Z-A, z-a) for better selection/stacking
-        for text_elem in reversed(text_elements):
-            group.append(text_elem)
+        text_elements.reverse()
+        group.extend(text_elements)
 
         return group
 
+    def mm_to_uu(self, value_mm):
+        """
+        Convert millimeters to user units.
+
+        unittouu() is linear, so the 1mm factor is resolved once per run and
+        every later conversion is a single multiplication.
+
+        Args:
+            value_mm: Length in millimeters
+
+        Returns:
+            Length in user units
+        """
+        uu_per_mm = getattr(self, '_uu_per_mm', None)
+        if uu_per_mm is None:
+            uu_per_mm = self._uu_per_mm = self.svg.unittouu("1mm")
+        return value_mm * uu_per_mm
+
     def set_canvas_dimensions(self, width_mm, height_mm):
         """
         Set the canvas (page) dimensions.
@@ -273,64 +351,82 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
             height_mm: Height in millimeters
         """
         # Convert mm to user units
-        width_uu = self.svg.unittouu(f"{width_mm}mm")
-        height_uu = self.svg.unittouu(f"{height_mm}mm")
+        width_uu = self.mm_to_uu(width_mm)
+        height_uu = self.mm_to_uu(height_mm)
 
         # Set viewBox and width/height attributes
-        self.svg.set('viewBox', f'0 0 {width_uu} {height_uu}')
-        self.svg.set('width', f'{width_mm}mm')
-        self.svg.set('height', f'{height_mm}mm')
+        self._set_canvas_attributes(f'0 0 {width_uu} {height_uu}', width_mm, height_mm)
 
-    def resize_canvas_to_content(self, padding_mm=5):
+    def _set_canvas_attributes(self, viewbox, width_mm, height_mm):
         """
-        Resize the canvas to fit all content with specified padding.
+        Write viewBox, width and height onto the root in one attribute update.
 
         Args:
+            viewbox: Formatted viewBox string
+            width_mm: Width in millimeters
+            height_mm: Height in millimeters
+        """
+        width = f'{width_mm}mm'
+        height = f'{height_mm}mm'
+        self.svg.attrib.update({'viewBox': viewbox, 'width': width, 'height': height})
+        self._uu_per_mm = None  # viewBox changed, so the unit factor must be re-resolved
+
+    def resize_canvas_to_content(self, groups, padding_mm=5):
+        """
+        Resize the canvas to fit the given groups with specified padding.
+
+        Only the groups that were just added are measured, so defs, metadata
+        and other geometry-free root children are never visited.
+
+        Args:
+            groups: Groups whose combined bounding box defines the content
             padding_mm: Padding to add around content in millimeters
         """
-        # Get bounding box of all content in the document
-        bbox = None
-        for element in self.svg:
-            try:
-                elem_bbox = element.bounding_box()
-                if elem_bbox is not None:
-                    if bbox is None:
-                        bbox = elem_bbox
-                    else:
-                        bbox += elem_bbox
-            except:
-                # Some elements might not have bounding boxes
-                pass
-
-        if bbox is None:
+        # Get combined bounding box of the groups, tracked as four edges
+        min_left = min_top = float('inf')
+        max_right = max_bottom = float('-inf')
+        for group in groups:
+            elem_bbox = group.bounding_box()
+            if elem_bbox is None:
+                continue
+            if elem_bbox.left < min_left:
+                min_left = elem_bbox.left
+            if elem_bbox.top < min_top:
+                min_top = elem_bbox.top
+            if elem_bbox.right > max_right:
+                max_right = elem_bbox.right
+            if elem_bbox.bottom > max_bottom:
+                max_bottom = elem_bbox.bottom
+
+        if min_left == float('inf'):
             # Fallback to default size if no content found
             self.set_canvas_dimensions(width_mm=200, height_mm=60)
             return
 
         # Convert padding to user units
-        padding_uu = self.svg.unittouu(f"{padding_mm}mm")
+        padding_uu = self.mm_to_uu(padding_mm)
 
         # Add extra padding for top and right to account for text rendering quirks
         # Text bounding boxes don't always include full ascenders/descenders
-        padding_top_uu = self.svg.unittouu(f"{padding_mm + 3}mm")  # Extra 3mm on top
-        padding_right_uu = self.svg.unittouu(f"{padding_mm + 2}mm")  # Extra 2mm on right
+        padding_top_uu = self.mm_to_uu(padding_mm + 3)  # Extra 3mm on top
+        padding_right_uu = self.mm_to_uu(padding_mm + 2)  # Extra 2mm on right
 
         # Calculate canvas dimensions with asymmetric padding
-        width_uu = bbox.width + padding_uu + padding_right_uu  # left + right
-        height_uu = bbox.height + padding_top_uu + padding_uu  # top + bottom
+        width_uu = (max_right - min_left) + padding_uu + padding_right_uu  # left + right
+        height_uu = (max_bottom - min_top) + padding_top_uu + padding_uu  # top + bottom
 
         # Convert back to mm for setting attributes
         width_mm = self.svg.uutounit(width_uu, 'mm')
         height_mm = self.svg.uutounit(height_uu, 'mm')
 
         # Adjust viewBox to start at content origin minus padding
-        viewbox_x = bbox.left - padding_uu
-        viewbox_y = bbox.top - padding_top_uu
+        viewbox_x = min_left - padding_uu
+        viewbox_y = min_top - padding_top_uu
 
         # Set viewBox and dimensions
-        self.svg.set('viewBox', f'{viewbox_x} {viewbox_y} {width_uu} {height_uu}')
-        self.svg.set('width', f'{width_mm}mm')
-        self.svg.set('height', f'{height_mm}mm')
+        self._set_canvas_attributes(
+            f'{viewbox_x} {viewbox_y} {width_uu} {height_uu}', width_mm, height_mm
+        )
 
     def remove_all_layers(self):
         """
@@ -340,7 +436,10 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         This ensures a clean document with only the glyph preparation groups.
         """
         # Find all layers (groups with groupmode="layer")
-        layers = self.svg.findall('.//{http://www.w3.org/2000/svg}g[@{http://www.inkscape.org/namespaces/inkscape}groupmode="layer"]')
+        layers = [
+            group for group in self.svg.iter(SVG_GROUP_TAG)
+            if group.get(INKSCAPE_GROUPMODE_ATTR) == 'layer'
+        ]
 
         # Remove each layer
         for layer in layers:
@@ -355,23 +454,11 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         """
         fonts = self.get_system_fonts()
 
-        # Print header
-        inkex.errormsg("=" * 60)
-        inkex.errormsg(f"AVAILABLE SYSTEM FONTS ({len(fonts)} found)")
-        inkex.errormsg("=" * 60)
-        inkex.errormsg("")
-
-        # Print all fonts in alphabetical order
-        for font in sorted(fonts):
-            inkex.errormsg(f"  {font}")
-
-        inkex.errormsg("")
-        inkex.errormsg("=" * 60)
-        inkex.errormsg("NOTES:")
-        inkex.errormsg("- Font names are case-sensitive")
-        inkex.errormsg("- Use these exact names in the Font Family field")
-        inkex.errormsg("- Select style (Regular/Bold/Italic) using Font Style dropdown")
-        inkex.errormsg("=" * 60)
+        # Emit header, alphabetical listing and notes as a single message
+        rule = "=" * 60
+        header = f"{rule}\nAVAILABLE SYSTEM FONTS ({len(fonts)} found)\n{rule}\n"
+        listing = "\n".join(f"  {font}" for font in sorted(fonts))
+        inkex.errormsg(f"{header}\n{listing}\n\n{FONT_LIST_NOTES}")
 
     def get_system_fonts(self):
         """
@@ -380,34 +467,17 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
         Returns:
             set: Set of unique font family names
         """
-        fonts = set()
-
         # Try fontconfig (fc-list) - standard on Linux, what Inkscape uses
-        try:
-            result = subprocess.run(
-                ['fc-list', ':', 'family'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode == 0:
-                # Parse fc-list output
-                # Format: "Font Family,Alternative Name:style=Regular"
-                for line in result.stdout.split('\n'):
-                    line = line.strip()
-                    if line:
-                        # Extract family name (before colon or comma)
-                        family = line.split(':')[0].split(',')[0].strip()
-                        if family:
-                            fonts.add(family)
-
-                return fonts
-
-        except (subprocess.SubprocessError, FileNotFoundError):
-            pass
+        fontconfig_fonts = _list_fontconfig_families()
+        if fontconfig_fonts is not None:
+            return set(fontconfig_fonts)
+
+        fonts = set()
 
         # Fallback: try to find common font directories
+        # (pathlib is only needed when fc-list is unavailable, so import it here)
+        from pathlib import Path
+
         font_dirs = [
             Path.home() / '.fonts',
             Path.home() / '.local' / 'share' / 'fonts',
@@ -417,17 +487,14 @@ class PrepareGlyphLibrary(inkex.EffectExtension):
 
         for font_dir in font_dirs:
             if font_dir.exists():
-                # Find all font files
-                for ext in ['*.ttf', '*.otf', '*.TTF', '*.OTF']:
-                    for font_file in font_dir.rglob(ext):
-                        # Extract family name from filename (rough approximation)
-                        name = font_file.stem
-                        # Remove common style suffixes
-                        for suffix in ['-Regular', '-Bold', '-Italic', '-BoldItalic',
-                                      'Regular', 'Bold', 'Italic', 'BoldItalic']:
-                            if name.endswith(suffix):
-                                name = name[:-len(suffix)]
-                        fonts.add(name.strip())
+                # Find all font files in a single walk of the tree, matching
+                # the extension case-insensitively
+                for font_file in font_dir.rglob('*'):
+                    if font_file.suffix.lower() not in ('.ttf', '.otf'):
+                        continue
+                    # Extract family name from filename (rough approximation),
+                    # removing a common style suffix
+                    fonts.add(_STYLE_SUFFIX_RE.sub('', font_file.stem).strip())
 
         # If still no fonts found, return common defaults
         if not fonts:
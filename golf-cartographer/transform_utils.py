@@ -6,8 +6,8 @@ Provides shared utilities for SVG transforms, bounding box measurement,
 and stroke width management used across the yardage book pipeline.
 
 This module handles the complexities of SVG transform matrices, cumulative
-scaling, and the temporary group measurement pattern that enables accurate
-bounding box calculations with nested transforms.
+scaling, and bounding box measurement under an explicit parent transform,
+which enables accurate bounding box calculations with nested transforms.
 
 Author: Golf Yardage Book Extension Suite
 License: MIT
@@ -16,10 +16,11 @@ from __future__ import annotations
 
 import logging
 import math
-from typing import TYPE_CHECKING, List, Tuple, Optional, Union
+import re
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Tuple, Optional, Union
 
 import inkex
-from inkex import Transform, Group
+from inkex import Transform
 
 if TYPE_CHECKING:
     from inkex import BaseElement
@@ -33,13 +34,35 @@ BoundingBoxData = Tuple[float, float, float, float]  # (left, right, top, bottom
 # Constants
 TARGET_STROKE_MM: float = 0.25  # Target rendered stroke width in millimeters
 
+# Trailing unit suffix (e.g. 'mm', 'px', ' pt') on stroke widths passed as strings
+_UNIT_SUFFIX_RE = re.compile(r'[A-Za-z %]+$')
 
-class SimpleBoundingBox:
+# Memoized cumulative linear parts: {id(element): (element, a, b, c, d)}, where
+# (a, b, c, d) is the composed matrix of the element and all its ancestors
+# The element itself is kept in the entry so its id() cannot be reused while cached
+_SCALE_CACHE: Dict[int, Tuple[BaseElement, float, float, float, float]] = {}
+
+# Linear part (a, b, c, d) of an identity transform
+_IDENTITY_ABCD: Tuple[float, float, float, float] = (1.0, 0.0, 0.0, 1.0)
+
+# Shape elements that receive stroke properties, as raw lxml tags (SVG-namespaced
+# and bare) so they can be matched directly without splitting the namespace
+SVG_NS: str = '{http://www.w3.org/2000/svg}'
+SHAPE_TAGS: frozenset = frozenset(
+    prefix + name
+    for name in ('path', 'rect', 'circle', 'ellipse', 'polygon', 'polyline', 'line')
+    for prefix in (SVG_NS, '')
+)
+
+
+class SimpleBoundingBox(NamedTuple):
     """
     Simple bounding box class that mimics inkex.BoundingBox interface.
 
     This is used when we need to create a combined bounding box from multiple
     elements, since inkex.BoundingBox doesn't expose a constructor we can use.
+    Instances are immutable tuples of (left, right, top, bottom), so they are
+    cheap to build and can be hashed or cached.
 
     Attributes:
         left: Left edge x-coordinate
@@ -57,22 +80,20 @@ class SimpleBoundingBox:
         50.0
     """
 
-    def __init__(self, left: float, right: float, top: float, bottom: float) -> None:
-        """
-        Initialize bounding box with edge coordinates.
+    left: float
+    right: float
+    top: float
+    bottom: float
 
-        Args:
-            left: Left edge x-coordinate
-            right: Right edge x-coordinate
-            top: Top edge y-coordinate
-            bottom: Bottom edge y-coordinate
-        """
-        self.left = left
-        self.right = right
-        self.top = top
-        self.bottom = bottom
-        self.width = right - left
-        self.height = bottom - top
+    @property
+    def width(self) -> float:
+        """Width (right - left), derived from the edges on access."""
+        return self.right - self.left
+
+    @property
+    def height(self) -> float:
+        """Height (bottom - top), derived from the edges on access."""
+        return self.bottom - self.top
 
     def __repr__(self) -> str:
         return f"SimpleBoundingBox(left={self.left}, right={self.right}, top={self.top}, bottom={self.bottom})"
@@ -101,19 +122,172 @@ class SimpleBoundingBox:
         Returns:
             Tuple of (left, right, top, bottom)
         """
-        return (self.left, self.right, self.top, self.bottom)
+        return tuple(self)
+
+
+def _abcd_from_flat(matrix) -> Tuple[float, float, float, float]:
+    """Read (a, b, c, d) from a flat (a, b, c, d, e, f) matrix."""
+    return (matrix[0], matrix[1], matrix[2], matrix[3])
+
+
+def _abcd_from_rows(matrix) -> Tuple[float, float, float, float]:
+    """Read (a, b, c, d) from a row-major ((a, c, e), (b, d, f)) matrix."""
+    # Standard SVG matrix: [a c e; b d f] maps (x,y) → (ax+cy+e, bx+dy+f)
+    return (matrix[0][0], matrix[1][0], matrix[0][1], matrix[1][1])
+
+
+def _select_abcd_extractor():
+    """Pick the matrix reader matching this inkex version's matrix format."""
+    matrix = Transform().matrix
+    if hasattr(matrix, '__len__') and len(matrix) == 6:
+        return _abcd_from_flat
+    return _abcd_from_rows
+
+
+# Matrix format varies by inkex version but is fixed for the life of the
+# process, so the matching reader is chosen once at import time
+_extract_abcd = _select_abcd_extractor()
+
+
+def _linear_part(element: BaseElement) -> Tuple[float, float, float, float]:
+    """
+    Extract the linear part (a, b, c, d) of an element's own transform.
+
+    Identity and translation-only transforms, as well as transforms whose
+    matrix cannot be read, yield the identity (1, 0, 0, 1), which contributes
+    a scale of exactly 1 (no string formatting needed to detect them).
+
+    Args:
+        element: Element whose transform to read
+
+    Returns:
+        Tuple of (a, b, c, d) from the SVG matrix [a c e; b d f]
+    """
+    transform = element.transform
+    if transform is None:
+        return _IDENTITY_ABCD
+
+    try:
+        return _extract_abcd(transform.matrix)
+    except (IndexError, TypeError, ValueError) as e:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Could not extract scale from transform for element %s: %s",
+                element.get('id', 'unknown'),
+                e,
+            )
+        return _IDENTITY_ABCD
+
+
+def _compose_linear(
+    outer: Tuple[float, float, float, float],
+    inner: Tuple[float, float, float, float],
+) -> Tuple[float, float, float, float]:
+    """
+    Multiply two linear parts as SVG matrices: [outer] x [inner].
+
+    Args:
+        outer: (a, b, c, d) of the outer (parent-side) matrix
+        inner: (a, b, c, d) of the inner (child-side) matrix
+
+    Returns:
+        Tuple of (a, b, c, d) of the composed matrix
+    """
+    a1, b1, c1, d1 = outer
+    a2, b2, c2, d2 = inner
+    return (
+        a1 * a2 + c1 * b2,
+        b1 * a2 + d1 * b2,
+        a1 * c2 + c1 * d2,
+        b1 * c2 + d1 * d2,
+    )
+
+
+def _scales_of(abcd: Tuple[float, float, float, float]) -> Tuple[float, float, float]:
+    """
+    Decompose a linear part into (scale_x, scale_y, average).
+
+    Scale is the magnitude of the basis vectors; without rotation or skew
+    those are just |a| and |d|, so no square roots are needed.
+
+    Args:
+        abcd: Tuple of (a, b, c, d) from the SVG matrix [a c e; b d f]
+
+    Returns:
+        Tuple of (scale_x, scale_y, average)
+    """
+    a, b, c, d = abcd
+    if b == 0.0 and c == 0.0:
+        scale_x = abs(a)
+        scale_y = abs(d)
+    else:
+        scale_x = math.hypot(a, b)
+        scale_y = math.hypot(c, d)
+    return (scale_x, scale_y, (scale_x + scale_y) / 2.0)
+
+
+def _cumulative_linear_part(element: BaseElement) -> Tuple[float, float, float, float]:
+    """
+    Compose the linear parts of an element's transform and all its ancestors'.
+
+    Walks up only until an ancestor with a cached result, then composes the
+    uncached transforms top-down (four multiply-adds per non-identity level),
+    caching each node on the way.
+
+    Args:
+        element: Element whose transform chain to compose
+
+    Returns:
+        Tuple of (a, b, c, d) of the element's cumulative matrix
+    """
+    # Walk up until an ancestor with a cached result (or the root),
+    # collecting each uncached node with the linear part of its own transform
+    nodes: List[BaseElement] = []
+    linear_parts: List[Tuple[float, float, float, float]] = []
+    cumulative = _IDENTITY_ABCD
+    current: Optional[BaseElement] = element
+
+    # Bound methods are looked up once rather than on every ancestor
+    cache_get = _SCALE_CACHE.get
+    add_node = nodes.append
+    add_linear_part = linear_parts.append
+
+    while current is not None:
+        cached = cache_get(id(current))
+        if cached is not None and cached[0] is current:
+            cumulative = cached[1:]
+            break
+
+        add_node(current)
+        add_linear_part(_linear_part(current))
+        current = current.getparent()
+
+    # Compose the uncached nodes top-down, caching the cumulative matrix of each
+    for index in range(len(nodes) - 1, -1, -1):
+        abcd = linear_parts[index]
+        if abcd != _IDENTITY_ABCD:
+            cumulative = _compose_linear(cumulative, abcd)
+        node = nodes[index]
+        _SCALE_CACHE[id(node)] = (node,) + cumulative
+
+    return cumulative
 
 
 def get_cumulative_scale(element: BaseElement, return_components: bool = False) -> float | tuple[float, float, float]:
     """
     Calculate the cumulative scale factor from an element's transform chain.
 
-    This walks up the element hierarchy and extracts the scale component from
-    each transform matrix by calculating the magnitude of the basis vectors.
-
-    The scale is extracted from the transform matrix by computing:
-    - scale_x = sqrt(a² + b²)  where [a, b] is the x-basis vector
-    - scale_y = sqrt(c² + d²)  where [c, d] is the y-basis vector
+    This composes the linear parts of the transforms of the element and all its
+    ancestors into one matrix, then extracts the scale from that matrix by
+    calculating the magnitude of its basis vectors. Composing first keeps
+    chains that mix rotation with non-uniform scale exact, and needs no square
+    roots per level. Composed matrices are memoized per element (see
+    clear_scale_cache()), so sibling elements share the work of walking their
+    common ancestors.
+
+    The scale is extracted from the composed matrix by computing:
+    - scale_x = hypot(a, b) = sqrt(a² + b²)  where [a, b] is the x-basis vector
+    - scale_y = hypot(c, d) = sqrt(c² + d²)  where [c, d] is the y-basis vector
     - scale = (scale_x + scale_y) / 2
 
     Args:
@@ -128,47 +302,26 @@ def get_cumulative_scale(element: BaseElement, return_components: bool = False)
         >>> # Use for stroke compensation
         >>> compensated_stroke = target_stroke / scale
     """
-    cumulative_scale = 1.0
-    cumulative_scale_x = 1.0
-    cumulative_scale_y = 1.0
-    current: Optional[BaseElement] = element
+    components = _scales_of(_cumulative_linear_part(element))
+    if return_components:
+        return components
+    return components[2]
 
-    while current is not None:
-        transform = current.transform
-        if transform is not None and str(transform) != str(Transform()):
-            matrix = transform.matrix
-
-            try:
-                # Extract scale from transform matrix
-                # Matrix format varies by inkex version
-                if hasattr(matrix, '__len__') and len(matrix) == 6:
-                    # Flat tuple format: (a, b, c, d, e, f)
-                    a, b, c, d = matrix[0], matrix[1], matrix[2], matrix[3]
-                else:
-                    # 2D matrix format (row-major): [[a, c, e], [b, d, f]]
-                    # Standard SVG matrix: [a c e; b d f] maps (x,y) → (ax+cy+e, bx+dy+f)
-                    a, b = matrix[0][0], matrix[1][0]
-                    c, d = matrix[0][1], matrix[1][1]
-
-                # Scale is the magnitude of the basis vectors
-                scale_x = math.sqrt(a * a + b * b)
-                scale_y = math.sqrt(c * c + d * d)
-                scale = (scale_x + scale_y) / 2.0
-                cumulative_scale *= scale
-                cumulative_scale_x *= scale_x
-                cumulative_scale_y *= scale_y
-            except (IndexError, TypeError, ValueError) as e:
-                logger.debug(
-                    "Could not extract scale from transform for element %s: %s",
-                    element.get('id', 'unknown'),
-                    e,
-                )
 
-        current = current.getparent()
+def clear_scale_cache() -> None:
+    """
+    Forget all memoized cumulative scales.
 
-    if return_components:
-        return (cumulative_scale_x, cumulative_scale_y, cumulative_scale)
-    return cumulative_scale
+    get_cumulative_scale() caches the composed matrix of every element it visits, so
+    callers must clear the cache whenever transforms in the document change
+    (and at the start of each extension run).
+
+    Examples:
+        >>> position_holes(root)  # rewrites hole transforms
+        >>> clear_scale_cache()
+        >>> scale = get_cumulative_scale(green)
+    """
+    _SCALE_CACHE.clear()
 
 
 def set_stroke_recursive(
@@ -179,7 +332,7 @@ def set_stroke_recursive(
     """
     Set stroke properties on an element and all its descendants in millimeters.
 
-    This recursively walks the element tree and applies stroke properties
+    This walks the element tree and applies stroke properties
     to all shape elements (path, rect, circle, ellipse, polygon, polyline, line).
     The stroke width is always specified with 'mm' units for consistent print output.
 
@@ -205,38 +358,57 @@ def set_stroke_recursive(
         >>> # Set stroke with vector-effect (only for parent transforms)
         >>> set_stroke_recursive(my_group, 0.25, use_vector_effect=True)
     """
-    # Convert to float if string
+    # Convert to float if string (callers normally pass floats already)
     if isinstance(stroke_width_mm, str):
         # Remove any existing units for clean conversion
-        stroke_width_mm = stroke_width_mm.rstrip('mmpxtin ')
-        stroke_width_mm = float(stroke_width_mm)
+        stroke_width_mm = float(_UNIT_SUFFIX_RE.sub('', stroke_width_mm))
 
     # IMPORTANT: Store as unitless value (user units), NOT with 'mm' suffix
     # When stroke-width has explicit units (e.g., "1.378mm"), Inkscape applies
     # an incorrect conversion factor (~1.459x) when rendering transformed elements.
     # Storing as unitless user units avoids this issue and renders correctly.
     stroke_width_str = f'{stroke_width_mm}'
-    shape_tags = ['path', 'rect', 'circle', 'ellipse', 'polygon', 'polyline', 'line']
-    local_tag = element.tag.split('}')[-1] if '}' in element.tag else element.tag
-
-    if local_tag in shape_tags:
+    stroke_properties = {
+        'stroke': '#000000',                 # Black stroke
+        'stroke-width': stroke_width_str,    # Width in mm
+        'stroke-opacity': '1',               # Full opacity
+    }
+    if use_vector_effect:
+        stroke_properties['vector-effect'] = 'non-scaling-stroke'    # Prevent scaling
+
+    # Walk the element and all its shape descendants in one iterative pass
+    # (lxml filters the tags and yields matches in document order, so no Python
+    # recursion or per-node tag check is needed)
+    style_class = inkex.Style
+    # Shapes without any inline style get exactly these declarations, so that
+    # string is serialized once instead of parsed and rebuilt per shape
+    stroke_only = style_class(None)
+    stroke_only.update(stroke_properties)
+    stroke_only_style = str(stroke_only)
+    # Checked once per call so failing nodes don't build log arguments for nothing
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    for node in element.iter(*SHAPE_TAGS):
         try:
-            style = element.style
-            style['stroke'] = '#000000'                      # Black stroke
-            style['stroke-width'] = stroke_width_str         # Width in mm
-            style['stroke-opacity'] = '1'                    # Full opacity
-            if use_vector_effect:
-                style['vector-effect'] = 'non-scaling-stroke'    # Prevent scaling
-            element.style = style
+            # Parse the style attribute once, merge all stroke properties and
+            # write the serialized result back in a single attribute set,
+            # skipping the write when the shape already has these properties
+            current_style = node.get('style')
+            if not current_style:
+                node.set('style', stroke_only_style)
+                continue
+
+            style = style_class(current_style)
+            style.update(stroke_properties)
+            new_style = str(style)
+            if new_style != current_style:
+                node.set('style', new_style)
         except (AttributeError, TypeError, KeyError) as e:
-            logger.debug(
-                "Could not set stroke properties for element %s: %s",
-                element.get('id', 'unknown'),
-                e,
-            )
-
-    for child in element:
-        set_stroke_recursive(child, stroke_width_mm, use_vector_effect)
+            if debug_enabled:
+                logger.debug(
+                    "Could not set stroke properties for element %s: %s",
+                    node.get('id', 'unknown'),
+                    e,
+                )
 
 
 def apply_stroke_compensation(
@@ -269,7 +441,8 @@ def apply_stroke_compensation(
         # Apply target stroke directly - vector-effect prevents scaling
         set_stroke_recursive(element, target_stroke_mm, use_vector_effect=True)
     else:
-        # Calculate compensated stroke for all transforms
+        # Calculate compensated stroke for all transforms (one memoized walk;
+        # an unscaled chain yields exactly 1.0 and leaves the target unchanged)
         cumulative_scale = get_cumulative_scale(element)
         if cumulative_scale <= 0:
             cumulative_scale = 1.0
@@ -277,6 +450,66 @@ def apply_stroke_compensation(
         set_stroke_recursive(element, compensated_mm, use_vector_effect=False)
 
 
+def apply_stroke_compensation_batch(
+    parent: BaseElement,
+    children: List[BaseElement],
+    target_stroke_mm: float = TARGET_STROKE_MM,
+) -> None:
+    """
+    Apply compensated stroke width to several children of one parent.
+
+    The parent's cumulative matrix is composed once; each child then only
+    contributes its own transform, so the shared ancestor chain is never
+    walked per child.
+
+    Args:
+        parent: Common parent of all children
+        children: Elements to apply stroke to (direct children of parent)
+        target_stroke_mm: Target stroke width in millimeters (default 0.25mm)
+
+    Examples:
+        >>> terrain = [green, fairways_group, bunkers_group]
+        >>> apply_stroke_compensation_batch(hole_group, terrain)
+    """
+    parent_linear = _cumulative_linear_part(parent)
+    parent_scale = _scales_of(parent_linear)[2]
+
+    for child in children:
+        abcd = _linear_part(child)
+        if abcd == _IDENTITY_ABCD:
+            cumulative_scale = parent_scale
+        else:
+            cumulative_scale = _scales_of(_compose_linear(parent_linear, abcd))[2]
+        if cumulative_scale <= 0:
+            cumulative_scale = 1.0
+        set_stroke_recursive(child, target_stroke_mm / cumulative_scale, use_vector_effect=False)
+
+
+def _union_bounding_boxes(bboxes) -> Optional[SimpleBoundingBox]:
+    """
+    Combine bounding boxes into one, ignoring missing (None) boxes.
+
+    Args:
+        bboxes: Iterable of bounding boxes (anything with left/right/top/bottom) or None
+
+    Returns:
+        SimpleBoundingBox enclosing all boxes, or None if there were none
+    """
+    left = top = float('inf')
+    right = bottom = float('-inf')
+    for bbox in bboxes:
+        if not bbox:
+            continue
+        left = min(left, bbox.left)
+        right = max(right, bbox.right)
+        top = min(top, bbox.top)
+        bottom = max(bottom, bbox.bottom)
+
+    if left == float('inf'):
+        return None
+    return SimpleBoundingBox(left=left, right=right, top=top, bottom=bottom)
+
+
 def measure_elements_via_temp_group(
     elements: List[BaseElement],
     document_root: inkex.SvgDocumentElement,
@@ -284,25 +517,18 @@ def measure_elements_via_temp_group(
     temp_group_id: Optional[str] = None,
 ) -> Optional[SimpleBoundingBox]:
     """
-    Measure bounding box by temporarily moving elements to document root.
-
-    This method temporarily moves elements to a root-level group to get
-    accurate bounding box measurements that account for transforms.
-    Uses try/finally to guarantee element restoration even if an exception occurs.
+    Measure bounding box as if elements sat in a root-level group.
 
-    Strategy:
-    1. Create temporary group at document root
-    2. Apply parent transform to temp group
-    3. Move elements to temp group
-    4. Measure bounding box of temp group
-    5. Restore elements to original positions (always, even if error)
-    6. Remove temp group
+    Gives the same result as moving the elements into a temporary group at
+    the document root carrying parent_transform and measuring that group,
+    but passes the transform straight to each element's bounding_box()
+    instead, so the document is never modified and nothing needs restoring.
 
     Args:
         elements: List of elements to measure
-        document_root: Document root element
-        parent_transform: Transform to apply to temp group (default: identity)
-        temp_group_id: ID for temp group (default: auto-generated)
+        document_root: Document root element (unused, kept for API compatibility)
+        parent_transform: Transform applied on top of each element's own (default: identity)
+        temp_group_id: Unused, kept for API compatibility
 
     Returns:
         SimpleBoundingBox or None if measurement fails
@@ -328,52 +554,6 @@ def measure_elements_via_temp_group(
     if parent_transform is None:
         parent_transform = Transform()
 
-    if temp_group_id is None:
-        temp_group_id = f'_temp_measure_{id(elements[0])}'
-
-    # Store original parent and index for each element
-    element_origins: List[Tuple[BaseElement, Optional[BaseElement], int]] = []
-    for element in elements:
-        original_parent = element.getparent()
-        original_index = list(original_parent).index(element) if original_parent is not None else 0
-        element_origins.append((element, original_parent, original_index))
-
-    # Create temporary group for measurement
-    temp_group = Group()
-    temp_group.set('id', temp_group_id)
-    temp_group.transform = parent_transform
-    document_root.append(temp_group)
-
-    result_bbox = None
-    try:
-        # Move elements to temp group for measurement
-        for element, _, _ in element_origins:
-            original_parent = element.getparent()
-            if original_parent is not None:
-                original_parent.remove(element)
-            temp_group.append(element)
-
-        # Perform the measurement
-        temp_bbox = temp_group.bounding_box()
-        if temp_bbox:
-            result_bbox = SimpleBoundingBox(
-                left=temp_bbox.left,
-                right=temp_bbox.right,
-                top=temp_bbox.top,
-                bottom=temp_bbox.bottom
-            )
-    finally:
-        # Always restore elements to their original positions
-        # Process in original order - insert() handles positioning correctly
-        for element, original_parent, original_index in element_origins:
-            # Only remove if element is still in temp_group
-            if element.getparent() is temp_group:
-                temp_group.remove(element)
-            if original_parent is not None:
-                original_parent.insert(original_index, element)
-
-        # Always remove the temp group from the document
-        if temp_group.getparent() is not None:
-            document_root.remove(temp_group)
-
-    return result_bbox
+    return _union_bounding_boxes(
+        element.bounding_box(transform=parent_transform) for element in elements
+    )